@@ -1,4 +1,16 @@
-from .main import part1, part2
+from intcode import VM, parse_input
+
+from .main import Game, part1, part2
+
+GAME = "104,-1,104,0,104,0,4,42,104,5,104,4,3,45,1,43,45,43,4,43,104,6,104,3,1001,42,1,42,1001,44,-1,44,1005,44,6,104,-1,104,0,104,1234,99,2,0,3,0"
+
+
+def test_game():
+    game = Game(VM(parse_input(GAME)))
+
+    assert game.play() == 1234
+    assert (game.ball, game.paddle, game.frames) == (4, 3, 3)
+    assert game.fps > 0
 
 
 def test_input():
@@ -1,33 +1,8 @@
 import collections
 import enum
-import operator
-import queue
-from typing import Iterator, TypeAlias
+from typing import NamedTuple, TypeAlias
 
-
-class Op(enum.IntEnum):
-    ADD = 1
-    MUL = 2
-    INPUT = 3
-    OUTPUT = 4
-    JUMP_IF_TRUE = 5
-    JUMP_IF_FALSE = 6
-    LESS_THEN = 7
-    EQUAL = 8
-    ADJUST = 9
-    HALT = 99
-
-
-class Parameter(enum.IntEnum):
-    A = 0
-    B = 1
-    C = 2
-
-
-class ParameterMode(enum.StrEnum):
-    POSITION = "0"
-    IMMEDIATE = "1"
-    RELATIVE = "2"
+from intcode import VM, parse_input
 
 
 class Movement(enum.IntEnum):
@@ -55,101 +30,6 @@ MOVEMENT = {
     Movement.EAST: (0, 1),
 }
 
-BACK_MOVEMENT = {
-    Movement.NORTH: Movement.SOUTH,
-    Movement.SOUTH: Movement.NORTH,
-    Movement.WEST: Movement.EAST,
-    Movement.EAST: Movement.WEST,
-}
-
-
-OP_FN = {
-    Op.ADD: operator.add,
-    Op.MUL: operator.mul,
-    Op.JUMP_IF_TRUE: operator.ne,
-    Op.JUMP_IF_FALSE: operator.eq,
-    Op.LESS_THEN: operator.lt,
-    Op.EQUAL: operator.eq,
-}
-
-
-def parse_input(input: str) -> list[int]:
-    return list(map(int, input.strip().split(",")))
-
-
-class VM:
-    def __init__(self, opcodes: list[int]) -> None:
-        self._queue: queue.Queue[int] = queue.Queue()
-
-        memory = collections.defaultdict(int)
-
-        for i, val in enumerate(opcodes):
-            memory[i] = val
-
-        self._memory = memory
-        self._relative_base = 0
-        self._iter = iter(self)
-
-    def __next__(self) -> int:
-        return next(self._iter)
-
-    def __iter__(self) -> Iterator[int]:
-        memory = self._memory
-        relative_base = self._relative_base
-
-        i = 0
-
-        while i < len(memory):
-            opcode = str(memory[i]).zfill(5)
-
-            instruction = Op(int(opcode[3:]))
-
-            parameters = []
-
-            for param, rel in zip((Parameter.C, Parameter.B, Parameter.A), (1, 2, 3)):
-                if opcode[param] == ParameterMode.IMMEDIATE:
-                    parameters.append(i + rel)
-                elif opcode[param] == ParameterMode.RELATIVE:
-                    parameters.append(relative_base + memory[i + rel])
-                elif opcode[param] == ParameterMode.POSITION:
-                    parameters.append(memory[i + rel])
-
-            if instruction in [Op.ADD, Op.MUL]:
-                memory[parameters[2]] = OP_FN[instruction](
-                    memory[parameters[0]], memory[parameters[1]]
-                )
-
-                i += 4
-            elif instruction == Op.INPUT:
-                memory[parameters[0]] = self._queue.get()
-
-                i += 2
-            elif instruction == Op.OUTPUT:
-                yield memory[parameters[0]]
-
-                i += 2
-            elif instruction in [Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE]:
-                i = (
-                    memory[parameters[1]]
-                    if OP_FN[instruction](memory[parameters[0]], 0)
-                    else i + 3
-                )
-            elif instruction in [Op.LESS_THEN, Op.EQUAL]:
-                memory[parameters[2]] = int(
-                    OP_FN[instruction](memory[parameters[0]], memory[parameters[1]])
-                )
-
-                i += 4
-            elif instruction == Op.ADJUST:
-                relative_base += memory[parameters[0]]
-
-                i += 2
-            elif instruction == Op.HALT:
-                break
-
-    def send(self, value: int) -> None:
-        self._queue.put(value)
-
 
 def get_distances(space: Space, start: Position) -> dict[Position, int]:
     queue = collections.deque([start])
@@ -157,7 +37,7 @@ def get_distances(space: Space, start: Position) -> dict[Position, int]:
     distances = {start: 0}
 
     while queue:
-        position = queue.pop()
+        position = queue.popleft()
 
         for p in map(
             lambda i: (position[0] + i[0], position[1] + i[1]), MOVEMENT.values()
@@ -172,15 +52,25 @@ def get_distances(space: Space, start: Position) -> dict[Position, int]:
     return distances
 
 
-def solution(input: str) -> tuple[Space, Position]:
+class Exploration(NamedTuple):
+    space: Space
+    distances: dict[Position, int]
+    oxygen_system: Position
+
+
+def explore(input: str) -> Exploration:
     opcodes = parse_input(input)
 
-    vm = VM(opcodes)
+    start = (0, 0)
 
-    space: Space = {}
+    space: Space = {start: StatusCode.SPACE}
+    distances = {start: 0}
+    oxygen_system = None
+
+    frontier = collections.deque([(start, VM(opcodes).snapshot())])
 
-    def explore(y: int, x: int) -> Position | None:
-        oxygen_system = None
+    while frontier:
+        (y, x), snapshot = frontier.popleft()
 
         for movement, (y_, x_) in MOVEMENT.items():
             position = (y_ + y, x_ + x)
@@ -188,43 +78,37 @@ def solution(input: str) -> tuple[Space, Position]:
             if position in space:
                 continue
 
-            vm.send(movement)
+            droid = VM.from_snapshot(snapshot)
+            droid.send(movement)
 
-            space[position] = StatusCode(next(vm))
+            space[position] = status = StatusCode(next(droid.outputs()))
 
-            match space[position]:
-                case StatusCode.OXYGEN_SYSTEM:
-                    oxygen_system = position
-                case StatusCode.SPACE:
-                    if result := explore(*position):
-                        oxygen_system = result
-                case StatusCode.WALL:
-                    continue
-
-            vm.send(BACK_MOVEMENT[movement])
+            if status == StatusCode.WALL:
+                continue
 
-            next(vm)
+            distances[position] = distances[y, x] + 1
 
-        return oxygen_system
+            if status == StatusCode.OXYGEN_SYSTEM:
+                oxygen_system = position
 
-    oxygen_system = explore(0, 0)
+            frontier.append((position, droid.snapshot()))
 
     if oxygen_system is None:
         raise Exception("not found")
 
-    return space, oxygen_system
+    return Exploration(space, distances, oxygen_system)
 
 
 def part1(input: str) -> int:
-    space, oxygen_system = solution(input)
+    exploration = explore(input)
 
-    return get_distances(space, (0, 0))[oxygen_system]
+    return exploration.distances[exploration.oxygen_system]
 
 
 def part2(input: str) -> int:
-    space, oxygen_system = solution(input)
+    exploration = explore(input)
 
-    return max(get_distances(space, oxygen_system).values())
+    return max(get_distances(exploration.space, exploration.oxygen_system).values())
 
 
 def main() -> None:
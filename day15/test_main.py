@@ -1,4 +1,16 @@
-from .main import part1, part2
+from .main import StatusCode, get_distances, part1, part2
+
+
+def test_get_distances():
+    space = {
+        (y, x): StatusCode.SPACE for y in range(3) for x in range(3) if (y, x) != (1, 1)
+    }
+
+    distances = get_distances(space, (0, 0))
+
+    assert distances[1, 2] == 3
+    assert distances[2, 2] == 4
+    assert max(distances.values()) == 4
 
 
 def test_input():
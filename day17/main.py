@@ -1,33 +1,9 @@
-import collections
 import enum
-import operator
-import queue
-from typing import Iterator, TypeAlias
+import functools
 
+from intcode import VM, Channel, parse_input
 
-class Op(enum.IntEnum):
-    ADD = 1
-    MUL = 2
-    INPUT = 3
-    OUTPUT = 4
-    JUMP_IF_TRUE = 5
-    JUMP_IF_FALSE = 6
-    LESS_THEN = 7
-    EQUAL = 8
-    ADJUST = 9
-    HALT = 99
-
-
-class Parameter(enum.IntEnum):
-    A = 0
-    B = 1
-    C = 2
-
-
-class ParameterMode(enum.StrEnum):
-    POSITION = "0"
-    IMMEDIATE = "1"
-    RELATIVE = "2"
+Routines = tuple[tuple[str, ...], ...]
 
 
 class Output(enum.IntEnum):
@@ -40,126 +16,143 @@ class Output(enum.IntEnum):
     NEW_LINE = ord("\n")
 
 
-OP_FN = {
-    Op.ADD: operator.add,
-    Op.MUL: operator.mul,
-    Op.JUMP_IF_TRUE: operator.ne,
-    Op.JUMP_IF_FALSE: operator.eq,
-    Op.LESS_THEN: operator.lt,
-    Op.EQUAL: operator.eq,
+DIRECTIONS = {
+    chr(Output.UP): (-1, 0),
+    chr(Output.DOWN): (1, 0),
+    chr(Output.LEFT): (0, -1),
+    chr(Output.RIGHT): (0, 1),
 }
 
+SCAFFOLD = chr(Output.SCAFFOLD)
 
-def parse_input(input: str) -> list[int]:
-    return list(map(int, input.strip().split(",")))
 
+def camera(opcodes: list[int]) -> list[str]:
+    return "".join(map(chr, VM(opcodes).outputs())).split()
 
-class VM:
-    def __init__(self, opcodes: list[int]) -> None:
-        self._queue: queue.Queue[int] = queue.Queue()
 
-        memory = collections.defaultdict(int)
+def alignment(grid: list[str]) -> int:
+    scaffold = {
+        (y, x)
+        for y, row in enumerate(grid)
+        for x, c in enumerate(row)
+        if c == SCAFFOLD or c in DIRECTIONS
+    }
+
+    return sum(
+        y * x
+        for y, x in scaffold
+        if {(y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)} <= scaffold
+    )
 
-        for i, val in enumerate(opcodes):
-            memory[i] = val
 
-        self._memory = memory
-        self._relative_base = 0
-        self._iter = iter(self)
+def trace(grid: list[str]) -> list[str]:
+    scaffold = {
+        (y, x) for y, row in enumerate(grid) for x, c in enumerate(row) if c != "."
+    }
+
+    (y, x), c = next(
+        ((y, x), c)
+        for y, row in enumerate(grid)
+        for x, c in enumerate(row)
+        if c in DIRECTIONS
+    )
+
+    dy, dx = DIRECTIONS[c]
+
+    tokens: list[str] = []
+
+    while True:
+        if (y - dx, x + dy) in scaffold:
+            turn, (dy, dx) = "L", (-dx, dy)
+        elif (y + dx, x - dy) in scaffold:
+            turn, (dy, dx) = "R", (dx, -dy)
+        else:
+            return tokens
+
+        distance = 0
 
-    def __next__(self) -> int:
-        return next(self._iter)
+        while (y + dy, x + dx) in scaffold:
+            y, x = y + dy, x + dx
+            distance += 1
 
-    def __iter__(self) -> Iterator[int]:
-        memory = self._memory
-        relative_base = self._relative_base
+        tokens.append(f"{turn},{distance}")
 
-        i = 0
 
-        while i < len(memory):
-            opcode = str(memory[i]).zfill(5)
+def compress(
+    tokens: list[str], count: int = 3, limit: int = 20
+) -> tuple[str, list[str]]:
+    path = tuple(tokens)
+    calls = (limit + 1) // 2
 
-            instruction = Op(int(opcode[3:]))
+    def length(routine: tuple[str, ...]) -> int:
+        return sum(map(len, routine)) + len(routine) - 1
 
-            parameters = []
+    @functools.cache
+    def matches(start: int, routine: tuple[str, ...]) -> bool:
+        return path[start : start + len(routine)] == routine
 
-            for param, rel in zip((Parameter.C, Parameter.B, Parameter.A), (1, 2, 3)):
-                if opcode[param] == ParameterMode.IMMEDIATE:
-                    parameters.append(i + rel)
-                elif opcode[param] == ParameterMode.RELATIVE:
-                    parameters.append(relative_base + memory[i + rel])
-                elif opcode[param] == ParameterMode.POSITION:
-                    parameters.append(memory[i + rel])
+    @functools.cache
+    def solve(
+        start: int, routines: Routines, depth: int
+    ) -> tuple[str, Routines] | None:
+        if start == len(path):
+            return "", routines
 
-            if instruction in [Op.ADD, Op.MUL]:
-                memory[parameters[2]] = OP_FN[instruction](
-                    memory[parameters[0]], memory[parameters[1]]
-                )
+        if depth == calls:
+            return None
 
-                i += 4
-            elif instruction == Op.INPUT:
-                memory[parameters[0]] = self._queue.get()
+        for i, routine in enumerate(routines):
+            if matches(start, routine):
+                result = solve(start + len(routine), routines, depth + 1)
 
-                i += 2
-            elif instruction == Op.OUTPUT:
-                yield memory[parameters[0]]
+                if result is not None:
+                    return chr(ord("A") + i) + result[0], result[1]
 
-                i += 2
-            elif instruction in [Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE]:
-                i = (
-                    memory[parameters[1]]
-                    if OP_FN[instruction](memory[parameters[0]], 0)
-                    else i + 3
-                )
-            elif instruction in [Op.LESS_THEN, Op.EQUAL]:
-                memory[parameters[2]] = int(
-                    OP_FN[instruction](memory[parameters[0]], memory[parameters[1]])
-                )
+        if len(routines) == count:
+            return None
 
-                i += 4
-            elif instruction == Op.ADJUST:
-                relative_base += memory[parameters[0]]
+        for end in range(start + 1, len(path) + 1):
+            routine = path[start:end]
 
-                i += 2
-            elif instruction == Op.HALT:
+            if length(routine) > limit:
                 break
 
-    def send(self, value: int) -> None:
-        self._queue.put(value)
+            result = solve(end, routines + (routine,), depth + 1)
 
+            if result is not None:
+                return chr(ord("A") + len(routines)) + result[0], result[1]
 
-def part1(input: str) -> int:
-    opcodes = parse_input(input)
+        return None
 
-    points = {}
+    if (result := solve(0, (), 0)) is None:
+        raise ValueError("path does not fit in the movement functions")
 
-    vm = VM(opcodes)
+    main, routines = result
 
-    y, x = 0, 0
+    routines += (routines[0],) * (count - len(routines))
 
-    for i in vm:
-        out = Output(i)
+    return ",".join(main), [",".join(routine) for routine in routines]
 
-        if out == Output.NEW_LINE:
-            y += 1
-            x = 0
-        else:
-            points[y, x] = out
 
-            x += 1
+def part1(input: str) -> int:
+    opcodes = parse_input(input)
 
-    return sum(
-        y * x
-        for y, x in points
-        if all(
-            points.get(i) == Output.SCAFFOLD
-            for i in ((y, x), (y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1))
-        )
-    )
+    return alignment(camera(opcodes))
 
 
 def part2(input: str) -> int:
-    pass
+    opcodes = parse_input(input)
+
+    main, routines = compress(trace(camera(opcodes)))
+
+    opcodes[0] = 2
+
+    reply = Channel(VM(opcodes)).command("\n".join([main, *routines, "n"]))
+
+    if reply.value is None:
+        raise ValueError(reply.text)
+
+    return reply.value
 
 
 def main() -> None:
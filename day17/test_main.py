@@ -1,4 +1,52 @@
-from .main import part1, part2
+from .main import alignment, compress, part1, part2, trace
+
+ALIGNMENT = """
+..#..........
+..#..........
+#######...###
+#.#...#...#.#
+#############
+..#...#...#..
+..#####...^..
+""".split()
+
+SCAFFOLD = """
+#######...#####
+#.....#...#...#
+#.....#...#...#
+......#...#...#
+......#...###.#
+......#.....#.#
+^########...#.#
+......#.#...#.#
+......#########
+........#...#..
+....#########..
+....#...#......
+....#...#......
+....#...#......
+....#####......
+""".split()
+
+
+def test_alignment():
+    assert alignment(ALIGNMENT) == 76
+
+
+def test_compress():
+    tokens = trace(SCAFFOLD)
+
+    assert ",".join(tokens) == (
+        "R,8,R,8,R,4,R,4,R,8,L,6,L,2,R,4,R,4,R,8,R,8,R,8,L,6,L,2"
+    )
+
+    main, routines = compress(tokens)
+
+    assert len(routines) == 3
+    assert all(len(i) <= 20 for i in [main, *routines])
+    assert ",".join(routines[ord(i) - ord("A")] for i in main.split(",")) == (
+        ",".join(tokens)
+    )
 
 
 def test_input():
@@ -1,34 +1,7 @@
-import collections
 import enum
-import itertools
-import operator
-import queue
-from typing import Iterator, TypeAlias
+from typing import Callable, TypeAlias
 
-
-class Op(enum.IntEnum):
-    ADD = 1
-    MUL = 2
-    INPUT = 3
-    OUTPUT = 4
-    JUMP_IF_TRUE = 5
-    JUMP_IF_FALSE = 6
-    LESS_THEN = 7
-    EQUAL = 8
-    ADJUST = 9
-    HALT = 99
-
-
-class Parameter(enum.IntEnum):
-    A = 0
-    B = 1
-    C = 2
-
-
-class ParameterMode(enum.StrEnum):
-    POSITION = "0"
-    IMMEDIATE = "1"
-    RELATIVE = "2"
+from intcode import Memo, parse_input
 
 
 class Movement(enum.IntEnum):
@@ -44,8 +17,12 @@ class StatusCode(enum.IntEnum):
     OXYGEN_SYSTEM = 2
 
 
+MEMO_PATH = "memo.sqlite"
+
 Position: TypeAlias = tuple[int, int]
 
+Edges: TypeAlias = tuple[int, int]
+
 Space: TypeAlias = dict[Position, StatusCode]
 
 
@@ -64,121 +41,170 @@ BACK_MOVEMENT = {
 }
 
 
-OP_FN = {
-    Op.ADD: operator.add,
-    Op.MUL: operator.mul,
-    Op.JUMP_IF_TRUE: operator.ne,
-    Op.JUMP_IF_FALSE: operator.eq,
-    Op.LESS_THEN: operator.lt,
-    Op.EQUAL: operator.eq,
-}
+class VMChecker:
+    def __init__(self, memo: Memo) -> None:
+        self._memo = memo
+
+    def check(self, x: int, y: int) -> bool:
+        return bool(self._memo.run(x, y)[0])
+
+
+class Beam:
+    def __init__(self, check: Callable[[int, int], bool]) -> None:
+        self._check = check
+        self._rows: dict[int, Edges | None] = {}
+        self.probes = 0
+
+    def probe(self, x: int, y: int) -> bool:
+        self.probes += 1
+
+        return self._check(x, y)
+
+    def scan(self, rows: range, width: int) -> list[Edges | None]:
+        left, right = max(
+            (edges for i, edges in self._rows.items() if edges and i < rows.start),
+            default=(0, 0),
+        )
+
+        result: list[Edges | None] = []
 
+        for y in rows:
+            if y in self._rows:
+                result.append(self._rows[y])
+                left, right = self._rows[y] or (left, right)
+                continue
 
-def parse_input(input: str) -> list[int]:
-    return list(map(int, input.strip().split(",")))
+            x = left
 
+            while x < width and not self.probe(x, y):
+                x += 1
 
-class VM:
-    def __init__(self, opcodes: list[int]) -> None:
-        self._queue: queue.Queue[int] = queue.Queue()
+            if x == width:
+                result.append(None)
+                continue
 
-        memory = collections.defaultdict(int)
+            left = x
+            right = right if right > x and self.probe(right, y) else x
 
-        for i, val in enumerate(opcodes):
-            memory[i] = val
+            while right + 1 < width and self.probe(right + 1, y):
+                right += 1
 
-        self._memory = memory
-        self._relative_base = 0
-        self._iter = iter(self)
+            result.append((left, right))
 
-    def __next__(self) -> int:
-        return next(self._iter)
+            if right + 1 < width:
+                self._rows[y] = (left, right)
 
-    def __iter__(self) -> Iterator[int]:
-        memory = self._memory
-        relative_base = self._relative_base
+        return result
 
-        i = 0
+    def row(self, y: int) -> Edges | None:
+        if y in self._rows:
+            return self._rows[y]
 
-        while i < len(memory):
-            opcode = str(memory[i]).zfill(5)
+        reference, (left, right) = max(
+            (i, edges) for i, edges in self._rows.items() if edges and i
+        )
 
-            instruction = Op(int(opcode[3:]))
+        bound = (y + 1) * (right + 1) // reference + 2
 
-            parameters = []
+        x = y * left // reference
 
-            for param, rel in zip((Parameter.C, Parameter.B, Parameter.A), (1, 2, 3)):
-                if opcode[param] == ParameterMode.IMMEDIATE:
-                    parameters.append(i + rel)
-                elif opcode[param] == ParameterMode.RELATIVE:
-                    parameters.append(relative_base + memory[i + rel])
-                elif opcode[param] == ParameterMode.POSITION:
-                    parameters.append(memory[i + rel])
+        if self.probe(x, y):
+            left = self._edge(x, y, -1, True)
+        elif (outside := self._edge(x, y, 1, False, bound)) < bound:
+            left = outside + 1
+        else:
+            return self.scan(range(y, y + 1), bound)[0]
 
-            if instruction in [Op.ADD, Op.MUL]:
-                memory[parameters[2]] = OP_FN[instruction](
-                    memory[parameters[0]], memory[parameters[1]]
-                )
+        x = max(left, y * right // reference)
 
-                i += 4
-            elif instruction == Op.INPUT:
-                memory[parameters[0]] = self._queue.get()
+        if self.probe(x, y):
+            right = self._edge(x, y, 1, True)
+        else:
+            right = self._edge(x, y, -1, False) - 1
 
-                i += 2
-            elif instruction == Op.OUTPUT:
-                yield memory[parameters[0]]
+        self._rows[y] = (left, right)
 
-                i += 2
-            elif instruction in [Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE]:
-                i = (
-                    memory[parameters[1]]
-                    if OP_FN[instruction](memory[parameters[0]], 0)
-                    else i + 3
-                )
-            elif instruction in [Op.LESS_THEN, Op.EQUAL]:
-                memory[parameters[2]] = int(
-                    OP_FN[instruction](memory[parameters[0]], memory[parameters[1]])
-                )
+        return self._rows[y]
 
-                i += 4
-            elif instruction == Op.ADJUST:
-                relative_base += memory[parameters[0]]
+    def _edge(
+        self, x: int, y: int, direction: int, state: bool, bound: int | None = None
+    ) -> int:
+        step = 1
 
-                i += 2
-            elif instruction == Op.HALT:
+        while True:
+            other = x + step * direction
+
+            if bound is not None and other > bound:
+                if x >= bound:
+                    return bound
+
+                other = bound
+
+            if other < 0 or self.probe(other, y) != state:
                 break
 
-    def send(self, value: int) -> None:
-        self._queue.put(value)
+            x = other
+            step *= 2
 
+        other = max(other, -1)
 
-class VMChecker:
-    def __init__(self, input: str) -> None:
-        self._opcodes = parse_input(input)
+        while abs(other - x) > 1:
+            middle = (x + other) // 2
 
-    def check(self, x: int, y: int) -> bool:
-        vm = VM(self._opcodes)
-        vm.send(x)
-        vm.send(y)
-        return bool(next(vm))
+            if self.probe(middle, y) == state:
+                x = middle
+            else:
+                other = middle
+
+        return x
+
+    def fits(self, y: int, size: int) -> bool:
+        bottom = self.row(y)
+        top = self.row(y - size + 1)
+
+        return bool(bottom and top and top[1] >= bottom[0] + size - 1)
+
+    def square(self, size: int, window: int = 8) -> Position:
+        self.scan(range(50), 50)
+
+        low, high = size - 1, size
+
+        while not self.fits(high, size):
+            low, high = high, high * 2
+
+        while high - low > 1:
+            middle = (low + high) // 2
+
+            if self.fits(middle, size):
+                high = middle
+            else:
+                low = middle
+
+        y = high
+        misses = 0
+
+        for i in range(high - 1, size - 2, -1):
+            if self.fits(i, size):
+                y, misses = i, 0
+            elif (misses := misses + 1) == window:
+                break
+
+        if (edges := self.row(y)) is None:
+            raise ValueError(f"no {size}x{size} square in the beam")
 
+        return edges[0], y - size + 1
 
-def part1(input: str) -> int:
-    vm_checker = VMChecker(input)
 
-    return sum(
-        vm_checker.check(x, y) for x, y in itertools.product(range(50), repeat=2)
-    )
+def part1(input: str, path: str | None = None) -> int:
+    with Memo(parse_input(input), path=path) as memo:
+        rows = Beam(VMChecker(memo).check).scan(range(50), 50)
 
+    return sum(right - left + 1 for left, right in filter(None, rows))
 
-def part2(input: str) -> int:
-    vm_checker = VMChecker(input)
 
-    x = y = 0
-    while not vm_checker.check(x + 99, y):
-        y += 1
-        while not vm_checker.check(x, y + 99):
-            x += 1
+def part2(input: str, size: int = 100, path: str | None = None) -> int:
+    with Memo(parse_input(input), path=path) as memo:
+        x, y = Beam(VMChecker(memo).check).square(size)
 
     return x * 10_000 + y
 
@@ -187,8 +213,8 @@ def main() -> None:
     with open("input.txt") as file:
         input = file.read()
 
-    print("Part 1:", part1(input))
-    print("Part 2:", part2(input))
+    print("Part 1:", part1(input, MEMO_PATH))
+    print("Part 2:", part2(input, path=MEMO_PATH))
 
 
 if __name__ == "__main__":
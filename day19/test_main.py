@@ -1,4 +1,34 @@
-from .main import part1, part2
+from .main import Beam, part1, part2
+
+BEAM = "3,100,3,101,1002,100,13,102,1002,101,10,103,1001,102,1,102,7,103,102,104,1002,101,12,105,1001,105,1,105,1002,100,10,106,7,106,105,107,2,104,107,108,4,108,99"
+
+
+def test_part1():
+    assert part1(BEAM) == 494
+
+
+def test_memo(tmp_path):
+    path = str(tmp_path / "memo.sqlite")
+
+    assert part1(BEAM, path) == 494
+    assert part1(BEAM, path) == 494
+    assert part2(BEAM, 10, path) == 370039
+
+
+def test_part2():
+    assert part2(BEAM, 10) == 370039
+    assert part2(BEAM) == 3900408
+
+
+def test_beam():
+    for left, right, size, expected in (
+        (0.77, 0.84, 100, (2006, 2506)),
+        (0.5, 0.58, 30, (287, 545)),
+        (1.2, 1.35, 5, (77, 60)),
+    ):
+        beam = Beam(lambda x, y: left * y <= x <= right * y)
+
+        assert beam.square(size) == expected
 
 
 def test_input():
@@ -1,60 +1,165 @@
+import collections
 import itertools
-import operator
 
+import more_itertools
 
-def parse_input(input: str) -> list[int]:
-    return list(map(int, input.strip().split(",")))
+from intcode import VM, BatchVM, Op, ParameterMode, decode, parse_input
 
+TARGET = 19690720
+
+
+class Polynomial(dict[tuple[int, int], int]):
+    @classmethod
+    def constant(cls, value: int) -> "Polynomial":
+        return cls({(0, 0): value} if value else {})
+
+    def __add__(self, other: "Polynomial") -> "Polynomial":
+        result = Polynomial(self)
+
+        for power, coefficient in other.items():
+            result[power] = result.get(power, 0) + coefficient
+
+        return Polynomial({k: v for k, v in result.items() if v})
+
+    def __mul__(self, other: "Polynomial") -> "Polynomial":
+        result = Polynomial()
+
+        for (i1, j1), c1 in self.items():
+            for (i2, j2), c2 in other.items():
+                power = (i1 + i2, j1 + j2)
+                result[power] = result.get(power, 0) + c1 * c2
+
+        return Polynomial({k: v for k, v in result.items() if v})
+
+    def __call__(self, noun: int, verb: int) -> int:
+        return sum(c * noun**i * verb**j for (i, j), c in self.items())
+
+    def concrete(self) -> int:
+        if any(power != (0, 0) for power in self):
+            raise ValueError("symbolic value")
+
+        return self.get((0, 0), 0)
 
-def intcode_computer(opcodes: list[int], values: tuple[int, int] | None) -> int:
-    zero = opcodes[0]
 
+NOUN = Polynomial({(1, 0): 1})
+VERB = Polynomial({(0, 1): 1})
+
+
+def intcode_computer(opcodes: list[int], values: tuple[int, int] | None) -> int:
     opcodes = opcodes[:]
 
     if values:
         opcodes[1:3] = values
 
-    i = 0
+    vm = VM(opcodes)
+
+    more_itertools.consume(vm)
+
+    return vm.memory[0]
+
+
+def part1(input: str, values: tuple[int, int] | None = (12, 2)) -> int:
+    opcodes = parse_input(input)
+
+    return intcode_computer(opcodes, values)
 
-    while i < len(opcodes):
-        match opcodes[i]:
-            case 1:
-                op = operator.add
-            case 2:
-                op = operator.mul
-            case 99:
-                break
+
+def symbolic_computer(opcodes: list[int]) -> Polynomial:
+    memory: list[Polynomial | None] = [Polynomial.constant(i) for i in opcodes]
+    memory[1:3] = [NOUN, VERB]
+
+    def load(address: int) -> Polynomial:
+        value = memory[address]
+
+        if value is None:
+            raise ValueError(f"value at {address} depends on symbolic address")
+
+        return value
+
+    pc = 0
+
+    while True:
+        op, mode_a, mode_b, mode_c = decode(load(pc).concrete())
+
+        if op == Op.HALT:
+            return load(0)
+
+        if op not in (Op.ADD, Op.MUL) or mode_c != ParameterMode.POSITION:
+            raise ValueError(f"unsupported instruction at {pc}")
+
+        a, b = load(pc + 1), load(pc + 2)
+        c = load(pc + 3).concrete()
 
         try:
-            opcodes[opcodes[i + 3]] = op(
-                opcodes[opcodes[i + 1]], opcodes[opcodes[i + 2]]
-            )
-        except IndexError:
-            break
+            x = a if mode_a == ParameterMode.IMMEDIATE else load(a.concrete())
+            y = b if mode_b == ParameterMode.IMMEDIATE else load(b.concrete())
+        except ValueError:
+            memory[c] = None
+        else:
+            memory[c] = x + y if op == Op.ADD else x * y
 
-        i += 4
+        pc += 4
 
-        zero = opcodes[0]
 
-    return zero
+def solve(
+    polynomial: Polynomial, target: int, nouns: range, verbs: range
+) -> tuple[int, int] | None:
+    for noun in nouns:
+        coefficients: dict[int, int] = collections.defaultdict(int)
 
+        for (i, j), c in polynomial.items():
+            coefficients[j] += c * noun**i
 
-def part1(input: str, values: tuple[int, int] | None = (12, 2)) -> int:
-    opcodes = parse_input(input)
+        if any(coefficients[j] for j in coefficients if j > 1):
+            verb = next((v for v in verbs if polynomial(noun, v) == target), None)
+        elif not coefficients[1]:
+            verb = verbs[0] if coefficients[0] == target and verbs else None
+        else:
+            verb, remainder = divmod(target - coefficients[0], coefficients[1])
+            verb = verb if not remainder and verb in verbs else None
 
-    return intcode_computer(opcodes, values)
+        if verb is not None:
+            return noun, verb
 
+    return None
 
-def part2(input: str) -> int:
-    opcodes = parse_input(input)
+
+def brute_force(
+    opcodes: list[int], target: int, nouns: range, verbs: range
+) -> tuple[int, int] | None:
+    pairs = list(itertools.product(nouns, verbs))
+
+    vm = BatchVM(opcodes, [()] * len(pairs))
+    vm.memory[1][:] = [noun for noun, _ in pairs]
+    vm.memory[2][:] = [verb for _, verb in pairs]
+    vm.run()
 
     return next(
-        100 * noun + verb
-        for noun, verb in itertools.product(range(100), range(100))
-        if intcode_computer(opcodes, (noun, verb)) == 19690720
+        (pair for pair, zero in zip(pairs, vm.memory[0]) if zero == target), None
     )
 
 
+def part2(
+    input: str,
+    target: int = TARGET,
+    nouns: range = range(100),
+    verbs: range = range(100),
+) -> int:
+    opcodes = parse_input(input)
+
+    try:
+        pair = solve(symbolic_computer(opcodes), target, nouns, verbs)
+    except (ValueError, IndexError):
+        pair = brute_force(opcodes, target, nouns, verbs)
+
+    if pair is None:
+        raise ValueError(f"no noun and verb produce {target}")
+
+    noun, verb = pair
+
+    return 100 * noun + verb
+
+
 def main() -> None:
     with open("input.txt") as file:
         input = file.read()
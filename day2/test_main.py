@@ -1,4 +1,6 @@
-from .main import part1, part2
+from intcode import parse_input
+
+from .main import part1, part2, symbolic_computer
 
 
 def test_part1():
@@ -18,3 +20,21 @@ def test_input():
 
     assert part1(input) == 9581917
     assert part2(input) == 2505
+
+
+def test_part2():
+    program = "1,0,0,3,2,1,19,20,1,20,2,0,1,0,18,0,99,0,5,100,0"
+
+    for nouns in (range(21), range(5, 21)):
+        assert part2(program, 100 * 7 + 3 + 5, nouns, range(21)) == 703
+
+    answer = part2("1,1,2,0,99", 20, range(21), range(21))
+
+    assert part1("1,1,2,0,99", divmod(answer, 100)) == 20
+
+
+def test_symbolic_computer():
+    polynomial = symbolic_computer(parse_input("1102,1,2,0,1,0,1,0,99"))
+
+    assert polynomial(3, 4) == 15
+    assert polynomial == {(1, 1): 1, (1, 0): 1}
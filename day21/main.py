@@ -1,174 +1,405 @@
 import collections
-import enum
-import operator
-import queue
-from typing import Iterator
+import itertools
+import re
+import string
+from typing import Callable, Iterator, NamedTuple
 
+from intcode import VM, Channel, parse_input
 
-class Op(enum.IntEnum):
-    ADD = 1
-    MUL = 2
-    INPUT = 3
-    OUTPUT = 4
-    JUMP_IF_TRUE = 5
-    JUMP_IF_FALSE = 6
-    LESS_THEN = 7
-    EQUAL = 8
-    ADJUST = 9
-    HALT = 99
+SENSORS = string.ascii_uppercase[:9]
 
+TERM_SIZE = 3
 
-class Parameter(enum.IntEnum):
-    A = 0
-    B = 1
-    C = 2
+CLAUSE_SIZE = 2
 
+JUMP = 4
 
-class ParameterMode(enum.StrEnum):
-    POSITION = "0"
-    IMMEDIATE = "1"
-    RELATIVE = "2"
 
+def ground(hull: str, i: int) -> bool:
+    return i >= len(hull) or hull[i] == "#"
 
-OP_FN = {
-    Op.ADD: operator.add,
-    Op.MUL: operator.mul,
-    Op.JUMP_IF_TRUE: operator.ne,
-    Op.JUMP_IF_FALSE: operator.eq,
-    Op.LESS_THEN: operator.lt,
-    Op.EQUAL: operator.eq,
-}
 
+def sense(hull: str, position: int, sensors: int) -> int:
+    return sum(1 << k for k in range(sensors) if ground(hull, position + k + 1))
 
-def parse_input(input: str) -> list[int]:
-    return list(map(int, input.strip().split(",")))
 
+def execute(program: list[str], config: int) -> bool:
+    registers = {"T": False, "J": False}
 
-class VM:
-    def __init__(self, opcodes: list[int]) -> None:
-        self._queue: queue.Queue[int] = queue.Queue()
+    for line in program:
+        op, x, y = line.split()
 
-        memory = collections.defaultdict(int)
+        value = registers[x] if x in registers else bool(config >> SENSORS.index(x) & 1)
 
-        for i, val in enumerate(opcodes):
-            memory[i] = val
+        if op == "AND":
+            registers[y] = registers[y] and value
+        elif op == "OR":
+            registers[y] = registers[y] or value
+        else:
+            registers[y] = not value
 
-        self._memory = memory
-        self._relative_base = 0
-        self._iter = iter(self)
+    return registers["J"]
 
-    def __next__(self) -> int:
-        return next(self._iter)
 
-    def __iter__(self) -> Iterator[int]:
-        memory = self._memory
-        relative_base = self._relative_base
+def survives(hull: str, program: list[str], sensors: int) -> bool:
+    position = 0
 
-        i = 0
+    while position < len(hull):
+        jump = execute(program, sense(hull, position, sensors))
 
-        while i < len(memory):
-            opcode = str(memory[i]).zfill(5)
+        position += JUMP if jump else 1
 
-            instruction = Op(int(opcode[3:]))
+        if not ground(hull, position):
+            return False
 
-            parameters = []
+    return True
 
-            for param, rel in zip((Parameter.C, Parameter.B, Parameter.A), (1, 2, 3)):
-                if opcode[param] == ParameterMode.IMMEDIATE:
-                    parameters.append(i + rel)
-                elif opcode[param] == ParameterMode.RELATIVE:
-                    parameters.append(relative_base + memory[i + rel])
-                elif opcode[param] == ParameterMode.POSITION:
-                    parameters.append(memory[i + rel])
 
-            if instruction in [Op.ADD, Op.MUL]:
-                memory[parameters[2]] = OP_FN[instruction](
-                    memory[parameters[0]], memory[parameters[1]]
-                )
+def reachable(hull: str, sensors: int) -> set[int]:
+    configs = set()
+    positions = {0}
+    queue = collections.deque(positions)
 
-                i += 4
-            elif instruction == Op.INPUT:
-                memory[parameters[0]] = self._queue.get()
+    while queue:
+        position = queue.popleft()
 
-                i += 2
-            elif instruction == Op.OUTPUT:
-                yield memory[parameters[0]]
+        configs.add(sense(hull, position, sensors))
 
-                i += 2
-            elif instruction in [Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE]:
-                i = (
-                    memory[parameters[1]]
-                    if OP_FN[instruction](memory[parameters[0]], 0)
-                    else i + 3
-                )
-            elif instruction in [Op.LESS_THEN, Op.EQUAL]:
-                memory[parameters[2]] = int(
-                    OP_FN[instruction](memory[parameters[0]], memory[parameters[1]])
-                )
+        for step in (1, JUMP):
+            if (i := position + step) < len(hull) and ground(hull, i):
+                if i not in positions:
+                    positions.add(i)
+                    queue.append(i)
 
-                i += 4
-            elif instruction == Op.ADJUST:
-                relative_base += memory[parameters[0]]
+    return configs
 
-                i += 2
-            elif instruction == Op.HALT:
-                break
 
-    def send(self, value: int) -> None:
-        self._queue.put(value)
+def decisions(
+    hulls: list[str],
+    sensors: int,
+    assignment: dict[int, bool],
+    feasible: Callable[[dict[int, bool]], bool],
+    i: int = 0,
+    position: int = 0,
+) -> Iterator[dict[int, bool]]:
+    while i < len(hulls):
+        hull = hulls[i]
 
+        if position >= len(hull):
+            i, position = i + 1, 0
+            continue
 
-def solution(input: str, program: str) -> int:
-    opcodes = parse_input(input)
+        config = sense(hull, position, sensors)
 
-    vm = VM(opcodes)
+        if config in assignment:
+            position += JUMP if assignment[config] else 1
 
-    for i in map(ord, program):
-        vm.send(i)
+            if not ground(hull, position):
+                return
 
-    for i in vm:
-        try:
-            chr(i)
-        except Exception:
-            return i
-    
-    return -1
+            continue
 
+        for jump in (False, True):
+            if ground(hull, step := position + (JUMP if jump else 1)):
+                assignment[config] = jump
+
+                if feasible(assignment):
+                    yield from decisions(hulls, sensors, assignment, feasible, i, step)
+
+                del assignment[config]
+
+        return
+
+    yield dict(assignment)
+
+
+class Term(NamedTuple):
+    negative: int | None
+    positives: tuple[int, ...]
+
+    @property
+    def cost(self) -> int:
+        if self.negative is None and len(self.positives) == 1:
+            return 1
+
+        return len(self.positives) + 2
+
+    @property
+    def savings(self) -> int:
+        if self.negative is None:
+            return 2 if len(self.positives) > 1 else 0
+
+        return 1
+
+    def compile(self, first: bool) -> list[str]:
+        sensors = [SENSORS[i] for i in self.positives]
+        register = "J" if first else "T"
+
+        if self.negative is not None:
+            head = [f"NOT {SENSORS[self.negative]} {register}"]
+        elif first or len(sensors) == 1:
+            head = [f"OR {sensors.pop(0)} J"]
+            register = "J"
+        else:
+            head = [f"NOT {sensors.pop(0)} T", "NOT T T"]
+
+        tail = [] if register == "J" else ["OR T J"]
+
+        return head + [f"AND {i} {register}" for i in sensors] + tail
+
+
+class Clause(NamedTuple):
+    negative: int | None
+    positives: tuple[int, ...]
+
+    @property
+    def cost(self) -> int:
+        if self.negative is None:
+            return 1 if len(self.positives) == 1 else len(self.positives) + 2
+
+        return len(self.positives) + 2
+
+    def compile(self) -> list[str]:
+        sensors = [SENSORS[i] for i in self.positives]
+
+        if self.negative is None and len(sensors) == 1:
+            return [f"AND {sensors[0]} J"]
+
+        if self.negative is not None:
+            head = [f"NOT {SENSORS[self.negative]} T"]
+        else:
+            head = [f"NOT {sensors.pop(0)} T", "NOT T T"]
+
+        return head + [f"OR {i} T" for i in sensors] + ["AND T J"]
+
+
+class Candidate(NamedTuple):
+    term: Term
+    mask: int
+    weaker: tuple[int, ...]
+
+
+def compile_terms(terms: list[Term], clause: Clause | None = None) -> list[str]:
+    program = []
+
+    if terms:
+        first = max(terms, key=lambda i: i.savings)
+
+        program = first.compile(True) + [
+            line for term in terms if term is not first for line in term.compile(False)
+        ]
+
+    return program + (clause.compile() if clause else [])
+
+
+def literals(sensors: int, size: int) -> Iterator[tuple[int | None, tuple[int, ...]]]:
+    for negative in (None, *range(sensors)):
+        for n in range(size + 1):
+            for positives in itertools.combinations(range(sensors), n):
+                if negative not in positives and (negative is not None or positives):
+                    yield negative, positives
+
+
+def candidates(
+    configs: list[int], sensors: int
+) -> tuple[list[Candidate], list[tuple[Clause, int]]]:
+    ground = [
+        sum(1 << i for i, config in enumerate(configs) if config >> k & 1)
+        for k in range(sensors)
+    ]
+    full = (1 << len(configs)) - 1
+
+    masks = {}
+
+    for negative, positives in literals(sensors, TERM_SIZE):
+        mask = full if negative is None else full & ~ground[negative]
+
+        for k in positives:
+            mask &= ground[k]
+
+        masks[Term(negative, positives)] = mask
+
+    terms = []
+
+    for term, mask in masks.items():
+        negative, positives = term
+
+        weaker = [
+            Term(negative, tuple(i for i in positives if i != k)) for k in positives
+        ]
+
+        if negative is not None:
+            weaker.append(Term(None, positives))
+
+        terms.append(
+            Candidate(term, mask, tuple(masks[i] for i in weaker if i in masks))
+        )
+
+    terms.sort(key=lambda i: i.term.cost)
+
+    clauses = []
+
+    for negative, positives in literals(sensors, CLAUSE_SIZE):
+        if len(positives) + (negative is not None) > CLAUSE_SIZE:
+            continue
+
+        mask = 0 if negative is None else full & ~ground[negative]
+
+        for k in positives:
+            mask |= ground[k]
+
+        clauses.append((Clause(negative, positives), mask))
+
+    clauses.sort(key=lambda i: i[0].cost)
+
+    return terms, clauses
 
-def part1(input: str) -> int:
-    program = """NOT A T
-OR T J
-NOT B T
-OR T J
-NOT C T
-OR T J
-NOT D T
-NOT T T
-AND T J
-WALK
-"""
 
-    return solution(input, program)
+def cover(
+    candidates: list[Candidate], ones: int, zeros: int, limit: int
+) -> list[Term] | None:
+    terms = [
+        (term, mask)
+        for term, mask, weaker in candidates
+        if not mask & zeros and mask & ones and all(i & zeros for i in weaker)
+    ]
+
+    best: list[Term] | None = None
+    bound = limit + 1
+
+    def search(uncovered: int, chosen: list[Term], cost: int) -> None:
+        nonlocal best, bound
+
+        if not uncovered:
+            if (length := len(compile_terms(chosen))) < bound:
+                best, bound = list(chosen), length
+
+            return
+
+        if cost - 2 >= bound:
+            return
+
+        bit = uncovered & -uncovered
+
+        for term, mask in terms:
+            if mask & bit:
+                chosen.append(term)
+
+                search(uncovered & ~mask, chosen, cost + term.cost)
+
+                chosen.pop()
+
+    search(ones, [], 0)
+
+    return best
+
+
+def synthesize(
+    hulls: list[str], sensors: int, max_length: int = 15, attempts: int = 32
+) -> list[str]:
+    configs = sorted(set().union(*(reachable(hull, sensors) for hull in hulls)))
+    index = {config: i for i, config in enumerate(configs)}
+
+    terms, clauses = candidates(configs, sensors)
+
+    def split(assignment: dict[int, bool]) -> tuple[int, int]:
+        ones = sum(1 << index[c] for c, jump in assignment.items() if jump)
+        zeros = sum(1 << index[c] for c, jump in assignment.items() if not jump)
+
+        return ones, zeros
+
+    masks = sorted({i.mask for i in terms})
+
+    def feasible(assignment: dict[int, bool]) -> bool:
+        ones, zeros = split(assignment)
+
+        covered = 0
+
+        for mask in masks:
+            if not mask & zeros:
+                covered |= mask
+
+        return not ones & ~covered
+
+    best: list[str] | None = None
+    limit = max_length
+
+    for tried, assignment in enumerate(decisions(hulls, sensors, {}, feasible)):
+        if best is not None and tried >= attempts:
+            break
+
+        ones, zeros = split(assignment)
+
+        options: list[tuple[Clause | None, int]] = [(None, -1)]
+        options += [
+            (clause, mask)
+            for clause, mask in clauses
+            if not ones & ~mask and zeros & ~mask and clause.cost < limit
+        ]
+
+        for clause, mask in options:
+            cost = clause.cost if clause else 0
+
+            if (found := cover(terms, ones, zeros & mask, limit - cost)) is not None:
+                best = compile_terms(found, clause)
+                limit = len(best) - 1
+
+    if best is None:
+        raise ValueError(f"no springscript of {max_length} instructions survives")
+
+    return best
+
+
+def parse_hull(text: str) -> str:
+    match = re.search(r"^[#.]*#[#.]*$", text, re.MULTILINE)
+
+    if match is None:
+        raise ValueError(text)
+
+    return match.group()
+
+
+class Springdroid:
+    def __init__(self, opcodes: list[int]) -> None:
+        self._channel = Channel(VM(opcodes))
+        self.runs = 0
+
+        self._channel.read()
+
+    def run(self, program: list[str], command: str) -> int | str:
+        reply = self._channel.fork().command("\n".join(program + [command]))
+
+        self.runs += 1
+
+        if reply.value is not None:
+            return reply.value
+
+        return parse_hull(reply.text)
+
+
+def synthesis(input: str, sensors: int, command: str) -> int:
+    droid = Springdroid(parse_input(input))
+
+    hulls: list[str] = []
+
+    while True:
+        result = droid.run(synthesize(hulls, sensors), command)
+
+        if isinstance(result, int):
+            return result
+
+        if result in hulls:
+            raise ValueError(f"springscript fell into a known hull {result}")
+
+        hulls.append(result)
+
+
+def part1(input: str) -> int:
+    return synthesis(input, 4, "WALK")
 
 
 def part2(input: str) -> int:
-    program = """NOT A T
-OR T J
-NOT B T
-OR T J
-NOT C T
-OR T J
-NOT D T
-NOT T T
-AND T J
-NOT E T
-NOT T T
-OR H T
-AND T J
-RUN
-"""
-
-    return solution(input, program)
+    return synthesis(input, 9, "RUN")
 
 
 def main() -> None:
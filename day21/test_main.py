@@ -1,4 +1,59 @@
-from .main import part1, part2
+from .main import execute, parse_hull, part1, part2, survives, synthesize
+
+FAILURE = """Input instructions:
+
+Walking...
+
+
+Didn't make it across:
+
+.................
+.................
+@................
+#####.#..########
+
+.................
+.................
+.@...............
+#####.#..########
+"""
+
+
+def test_execute():
+    program = ["NOT A J", "NOT C T", "AND D T", "OR T J"]
+
+    assert execute(program, 0b1110)
+    assert execute(program, 0b1011)
+    assert not execute(program, 0b0011)
+    assert not execute(program, 0b1111)
+
+
+def test_synthesize():
+    assert parse_hull(FAILURE) == "#####.#..########"
+
+    for sensors, hulls in (
+        (4, ["#####.#..########", "#####...#########", "#####..#.########"]),
+        (9, ["#####.#.##..#####", "#####..####.#.###", "#####.##.##...###"]),
+    ):
+        program = synthesize(hulls, sensors)
+
+        assert len(program) <= 15
+        assert all(survives(hull, program, sensors) for hull in hulls)
+
+
+def test_synthesize_beyond_attempts():
+    hulls = [
+        "#####.###..######...####.#########.#######.##..########################",
+        "#####.####.#.#########.##.#.#####.###.####.#.##########.##############",
+        "#######.#######.###############...####.###..#.#########################",
+        "########.####.###.#####..#...######..##############.##################",
+        "#####...################..#########.##...####..#########################",
+    ]
+
+    program = synthesize(hulls, 9)
+
+    assert len(program) <= 15
+    assert all(survives(hull, program, 9) for hull in hulls)
 
 
 def test_input():
@@ -1,144 +1,202 @@
-import builtins
 import collections
-import enum
-import operator
-import queue
-from typing import Iterator
-
-import threading
-
-
-class Op(enum.IntEnum):
-    ADD = 1
-    MUL = 2
-    INPUT = 3
-    OUTPUT = 4
-    JUMP_IF_TRUE = 5
-    JUMP_IF_FALSE = 6
-    LESS_THEN = 7
-    EQUAL = 8
-    ADJUST = 9
-    HALT = 99
-
-
-class Parameter(enum.IntEnum):
-    A = 0
-    B = 1
-    C = 2
-
-
-class ParameterMode(enum.StrEnum):
-    POSITION = "0"
-    IMMEDIATE = "1"
-    RELATIVE = "2"
-
-
-OP_FN = {
-    Op.ADD: operator.add,
-    Op.MUL: operator.mul,
-    Op.JUMP_IF_TRUE: operator.ne,
-    Op.JUMP_IF_FALSE: operator.eq,
-    Op.LESS_THEN: operator.lt,
-    Op.EQUAL: operator.eq,
+import re
+from typing import NamedTuple
+
+from intcode import VM, Channel, Status, parse_input
+
+STEP_BUDGET = 100_000
+
+OUTPUT_BUDGET = 4096
+
+OPPOSITE = {
+    "north": "south",
+    "south": "north",
+    "west": "east",
+    "east": "west",
 }
 
 
-def parse_input(input: str) -> list[int]:
-    return list(map(int, input.strip().split(",")))
+class Room(NamedTuple):
+    name: str
+    doors: list[str]
+    items: list[str]
 
 
-class VM:
-    def __init__(self, opcodes: list[int]) -> None:
-        self._queue: queue.Queue[int] = queue.Queue()
+def parse_rooms(text: str) -> list[Room]:
+    rooms = []
 
-        memory = collections.defaultdict(int)
+    for match in re.finditer(r"== ([^\n]+) ==\n(.*?)(?=\n== |\Z)", text, re.DOTALL):
+        name, body = match.groups()
 
-        for i, val in enumerate(opcodes):
-            memory[i] = val
+        sections: dict[str, list[str]] = collections.defaultdict(list)
+        section = ""
 
-        self._memory = memory
-        self._relative_base = 0
-        self._iter = iter(self)
+        for line in body.splitlines():
+            if line.endswith(":"):
+                section = line
+            elif line.startswith("- "):
+                sections[section].append(line[2:])
 
-    def __next__(self) -> int:
-        return next(self._iter)
+        rooms.append(Room(name, sections["Doors here lead:"], sections["Items here:"]))
 
-    def __iter__(self) -> Iterator[int]:
-        memory = self._memory
-        relative_base = self._relative_base
+    return rooms
 
-        i = 0
 
-        while i < len(memory):
-            opcode = str(memory[i]).zfill(5)
+def command(vm: VM, text: str) -> str:
+    return Channel(vm).command(text).text
 
-            instruction = Op(int(opcode[3:]))
 
-            parameters = []
+def settle(vm: VM, text: str) -> str | None:
+    Channel(vm).write(f"{text}\n")
 
-            for param, rel in zip((Parameter.C, Parameter.B, Parameter.A), (1, 2, 3)):
-                if opcode[param] == ParameterMode.IMMEDIATE:
-                    parameters.append(i + rel)
-                elif opcode[param] == ParameterMode.RELATIVE:
-                    parameters.append(relative_base + memory[i + rel])
-                elif opcode[param] == ParameterMode.POSITION:
-                    parameters.append(memory[i + rel])
+    vm.output.clear()
 
-            if instruction in [Op.ADD, Op.MUL]:
-                memory[parameters[2]] = OP_FN[instruction](
-                    memory[parameters[0]], memory[parameters[1]]
-                )
+    for _ in range(OUTPUT_BUDGET):
+        status = vm.run(STEP_BUDGET)
 
-                i += 4
-            elif instruction == Op.INPUT:
-                memory[parameters[0]] = self._queue.get()
+        if status == Status.NEEDS_INPUT:
+            return "".join(map(chr, vm.output))
 
-                i += 2
-            elif instruction == Op.OUTPUT:
-                yield memory[parameters[0]]
+        if status != Status.HAS_OUTPUT:
+            return None
 
-                i += 2
-            elif instruction in [Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE]:
-                i = (
-                    memory[parameters[1]]
-                    if OP_FN[instruction](memory[parameters[0]], 0)
-                    else i + 3
-                )
-            elif instruction in [Op.LESS_THEN, Op.EQUAL]:
-                memory[parameters[2]] = int(
-                    OP_FN[instruction](memory[parameters[0]], memory[parameters[1]])
-                )
+    return None
 
-                i += 4
-            elif instruction == Op.ADJUST:
-                relative_base += memory[parameters[0]]
 
-                i += 2
-            elif instruction == Op.HALT:
-                break
+class Explorer:
+    def __init__(self, vm: VM) -> None:
+        self._vm = vm
+        self._rooms: dict[str, Room] = {}
+        self._doors: dict[str, dict[str, str]] = collections.defaultdict(dict)
+        self._items: dict[str, list[str]] = {}
+        self._checkpoint: tuple[str, str] | None = None
 
-    def send(self, value: int) -> None:
-        self._queue.put(value)
+        self._start = parse_rooms(Channel(vm).read().text)[-1]
 
+    def explore(self) -> None:
+        self._rooms[self._start.name] = self._start
 
-def part1(input: str) -> int:
-    opcodes = parse_input(input)
+        frontier = collections.deque([(self._start, self._vm.fork())])
+
+        while frontier:
+            room, here = frontier.popleft()
+
+            self._items[room.name] = [
+                item for item in room.items if self._safe(here, item, room)
+            ]
+
+            for door in room.doors:
+                if door in self._doors[room.name]:
+                    continue
+
+                vm = here.fork()
+
+                entered, *rest = parse_rooms(command(vm, door))
+
+                self._doors[room.name][door] = entered.name
+
+                if rest:
+                    self._checkpoint = room.name, door
+                    continue
+
+                self._doors[entered.name][OPPOSITE[door]] = room.name
+
+                if entered.name not in self._rooms:
+                    self._rooms[entered.name] = entered
+                    frontier.append((entered, vm))
+
+    def _safe(self, here: VM, item: str, room: Room) -> bool:
+        vm = here.fork()
+
+        if settle(vm, f"take {item}") is None:
+            return False
+
+        return (text := settle(vm, room.doors[0])) is not None and bool(
+            parse_rooms(text)
+        )
+
+    def _path(self, source: str, target: str) -> list[str]:
+        paths: dict[str, list[str]] = {source: []}
+        queue = collections.deque([source])
+
+        while queue:
+            room = queue.popleft()
+
+            if room == target:
+                return paths[room]
+
+            for door, next_room in self._doors[room].items():
+                if next_room in self._rooms and next_room not in paths:
+                    paths[next_room] = paths[room] + [door]
+                    queue.append(next_room)
 
-    vm = VM(opcodes)
+        raise ValueError(f"no path from {source} to {target}")
 
-    def get_input():
-        while True:
-            command = builtins.input().strip()
+    def _walk(self, source: str, target: str) -> None:
+        for door in self._path(source, target):
+            command(self._vm, door)
 
-            for i in command:
-                vm.send(ord(i))
-            vm.send(10)
+    def collect(self) -> list[str]:
+        if self._checkpoint is None:
+            raise ValueError("pressure-sensitive floor not found")
+
+        inventory = []
+        position = self._start.name
+
+        pending = {room for room, items in self._items.items() if items}
+
+        while pending:
+            room = min(pending, key=lambda i: len(self._path(position, i)))
+            pending.remove(room)
+
+            self._walk(position, room)
+            position = room
+
+            for item in self._items[room]:
+                command(self._vm, f"take {item}")
+                inventory.append(item)
+
+        self._walk(position, self._checkpoint[0])
+
+        return inventory
+
+    def crack(self, inventory: list[str]) -> int:
+        if self._checkpoint is None:
+            raise ValueError("pressure-sensitive floor not found")
+
+        _, door = self._checkpoint
+
+        previous = 0
+
+        for i in range(1 << len(inventory)):
+            gray = i ^ (i >> 1)
+
+            if changed := gray ^ previous:
+                bit = changed.bit_length() - 1
+                action = "drop" if gray & changed else "take"
+
+                command(self._vm, f"{action} {inventory[bit]}")
+
+            previous = gray
+
+            text = command(self._vm, door)
+
+            if self._vm.halted:
+                if (match := re.search(r"typing (\d+)", text)) is None:
+                    raise ValueError(text)
+
+                return int(match.group(1))
+
+        raise ValueError("no item combination opens the checkpoint")
+
+
+def part1(input: str) -> int:
+    opcodes = parse_input(input)
 
-    thread = threading.Thread(target=get_input)
-    thread.start()
+    explorer = Explorer(VM(opcodes, jit=True))
+    explorer.explore()
 
-    for i in vm:
-        print(chr(i), end="")
+    return explorer.crack(explorer.collect())
 
 
 def main() -> None:
@@ -1,4 +1,45 @@
-from .main import part1
+from intcode import VM, parse_input
+
+from .main import Room, parse_rooms, part1, settle
+
+EJECTED = """
+
+== Pressure-Sensitive Floor ==
+Analyzing...
+
+Doors here lead:
+- south
+
+A loud, robotic voice says "Alert! Droids on this ship are heavier than the detected value!" and you are ejected back to the checkpoint.
+
+
+
+== Security Checkpoint ==
+In the next room, a pressure-sensitive floor will verify your identity.
+
+Doors here lead:
+- north
+- south
+
+Items here:
+- mug
+- fuel cell
+
+Command?
+"""
+
+
+def test_parse_rooms():
+    assert parse_rooms(EJECTED) == [
+        Room("Pressure-Sensitive Floor", ["south"], []),
+        Room("Security Checkpoint", ["north", "south"], ["mug", "fuel cell"]),
+    ]
+
+
+def test_settle():
+    assert settle(VM(parse_input("3,20,4,20,1105,1,0")), "north") == "north\n"
+    assert settle(VM(parse_input("3,20,1105,1,2")), "north") is None
+    assert settle(VM(parse_input("3,20,99")), "north") is None
 
 
 def test_input():
@@ -0,0 +1,37 @@
+from .aio import AsyncVM, ring, run_all
+from .ascii import Channel, Reply
+from .batch import BatchVM
+from .disassembler import ControlFlowGraph, disassemble
+from .image import ProgramImage
+from .instruction import Instruction, Op, ParameterMode, decode
+from .memo import Memo
+from .profiler import Profile
+from .snapshot import Snapshot
+from .trace import Recorder, Replayer, Trace, traced
+from .vm import VM, Status, parse_input
+
+__all__ = [
+    "VM",
+    "Status",
+    "BatchVM",
+    "AsyncVM",
+    "Channel",
+    "Reply",
+    "Snapshot",
+    "ProgramImage",
+    "Profile",
+    "Memo",
+    "Trace",
+    "Recorder",
+    "Replayer",
+    "ControlFlowGraph",
+    "Instruction",
+    "Op",
+    "ParameterMode",
+    "decode",
+    "disassemble",
+    "parse_input",
+    "ring",
+    "run_all",
+    "traced",
+]
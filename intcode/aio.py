@@ -0,0 +1,62 @@
+import asyncio
+from typing import Iterable
+
+from .vm import VM
+
+
+class AsyncVM:
+    def __init__(
+        self,
+        opcodes: list[int],
+        input: asyncio.Queue[int] | None = None,
+        output: asyncio.Queue[int] | None = None,
+        jit: bool = False,
+    ) -> None:
+        self._vm = VM(opcodes, jit=jit)
+        self._input: asyncio.Queue[int] = (
+            input if input is not None else asyncio.Queue()
+        )
+        self._output: asyncio.Queue[int] = (
+            output if output is not None else asyncio.Queue()
+        )
+
+    @property
+    def vm(self) -> VM:
+        return self._vm
+
+    @property
+    def input(self) -> asyncio.Queue[int]:
+        return self._input
+
+    @property
+    def output(self) -> asyncio.Queue[int]:
+        return self._output
+
+    async def run(self) -> None:
+        for value in self._vm:
+            if value is None:
+                self._vm.send(await self._input.get())
+
+                while not self._input.empty():
+                    self._vm.send(self._input.get_nowait())
+            else:
+                await self._output.put(value)
+
+
+def ring(opcodes: list[int], size: int, jit: bool = False) -> list[AsyncVM]:
+    channels: list[asyncio.Queue[int]] = [asyncio.Queue() for _ in range(size)]
+
+    return [
+        AsyncVM(opcodes, channel, channels[(i + 1) % size], jit)
+        for i, channel in enumerate(channels)
+    ]
+
+
+async def run_all(vms: Iterable[AsyncVM]) -> None:
+    tasks = [asyncio.create_task(vm.run()) for vm in vms]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,45 @@
+from typing import NamedTuple
+
+from .vm import VM
+
+
+class Reply(NamedTuple):
+    text: str
+    value: int | None = None
+
+    @property
+    def lines(self) -> list[str]:
+        return self.text.splitlines()
+
+
+class Channel:
+    def __init__(self, vm: VM) -> None:
+        self._vm = vm
+
+    @property
+    def vm(self) -> VM:
+        return self._vm
+
+    def fork(self) -> "Channel":
+        return Channel(self._vm.fork())
+
+    def write(self, data: str | bytes) -> None:
+        self._vm.input.extend(data.encode("ascii") if isinstance(data, str) else data)
+
+    def read(self) -> Reply:
+        text = []
+        value = None
+
+        for i in self._vm.outputs():
+            if 0 <= i < 128:
+                text.append(i)
+            else:
+                value = i
+
+        return Reply(bytes(text).decode("ascii"), value)
+
+    def command(self, data: str | bytes) -> Reply:
+        self.write(data)
+        self.write(b"\n")
+
+        return self.read()
@@ -0,0 +1,185 @@
+import collections
+import heapq
+import operator
+from typing import Sequence, TypeAlias
+
+import more_itertools
+
+from .instruction import OP_FN, Instruction, Op, ParameterMode, decode
+
+Addresses: TypeAlias = int | list[int]
+
+
+BINARY = (Op.ADD, Op.MUL, Op.LESS_THEN, Op.EQUAL)
+
+
+def uniform(values: list[int]) -> Addresses:
+    return values[0] if values.count(values[0]) == len(values) else values
+
+
+class BatchVM:
+    def __init__(self, opcodes: list[int], inputs: Sequence[Sequence[int]]) -> None:
+        self._lanes = len(inputs)
+        self._memory = [[word] * self._lanes for word in opcodes]
+        self._relative_base = [0] * self._lanes
+        self._input = [collections.deque(i) for i in inputs]
+        self._output: list[list[int]] = [[] for _ in inputs]
+
+    @property
+    def memory(self) -> list[list[int]]:
+        return self._memory
+
+    @property
+    def output(self) -> list[list[int]]:
+        return self._output
+
+    def run(self) -> list[list[int]]:
+        groups = {0: list(range(self._lanes))}
+        pcs = [0]
+
+        while pcs:
+            pc = heapq.heappop(pcs)
+            lanes = sorted(groups.pop(pc))
+
+            words = self._load(lanes, pc)
+
+            if isinstance(word := uniform(words), int):
+                divergent = {word: lanes}
+            else:
+                divergent = collections.defaultdict(list)
+
+                for lane, word in zip(lanes, words):
+                    divergent[word].append(lane)
+
+            for word, lanes in divergent.items():
+                targets = self._execute(pc, decode(word), lanes)
+
+                if isinstance(targets, int):
+                    if targets not in groups:
+                        groups[targets] = []
+                        heapq.heappush(pcs, targets)
+
+                    groups[targets].extend(lanes)
+                    continue
+
+                for lane, target in zip(lanes, targets):
+                    if target is None:
+                        continue
+
+                    if target not in groups:
+                        groups[target] = []
+                        heapq.heappush(pcs, target)
+
+                    groups[target].append(lane)
+
+        return self._output
+
+    def _column(self, address: int) -> list[int]:
+        if address >= len(self._memory):
+            size = max(address + 1, 2 * len(self._memory))
+
+            self._memory.extend(
+                [0] * self._lanes for _ in range(size - len(self._memory))
+            )
+
+        return self._memory[address]
+
+    def _load(self, lanes: list[int], addresses: Addresses) -> list[int]:
+        if isinstance(addresses, int):
+            column = self._column(addresses)
+
+            if len(lanes) == self._lanes:
+                return column[:]
+
+            return list(map(column.__getitem__, lanes))
+
+        return [self._column(i)[lane] for lane, i in zip(lanes, addresses)]
+
+    def _store(self, lanes: list[int], addresses: Addresses, values: list[int]) -> None:
+        if isinstance(addresses, int):
+            column = self._column(addresses)
+
+            if len(lanes) == self._lanes:
+                column[:] = values
+            else:
+                more_itertools.consume(map(column.__setitem__, lanes, values))
+        else:
+            for lane, i, value in zip(lanes, addresses, values):
+                self._column(i)[lane] = value
+
+    def _addresses(self, lanes: list[int], pc: int, mode: ParameterMode) -> Addresses:
+        if mode == ParameterMode.IMMEDIATE:
+            return pc
+
+        addresses = self._load(lanes, pc)
+
+        if mode == ParameterMode.RELATIVE:
+            relative_base = map(self._relative_base.__getitem__, lanes)
+
+            addresses = list(map(operator.add, relative_base, addresses))
+
+        return uniform(addresses)
+
+    def _execute(
+        self, pc: int, instruction: Instruction, lanes: list[int]
+    ) -> int | Sequence[int | None]:
+        op, mode_a, mode_b, mode_c = instruction
+
+        if op == Op.HALT:
+            return [None] * len(lanes)
+
+        a = self._addresses(lanes, pc + 1, mode_a)
+
+        if op == Op.INPUT:
+            return self._read_input(lanes, pc, a)
+
+        x = self._load(lanes, a)
+
+        if op in BINARY:
+            y = self._load(lanes, self._addresses(lanes, pc + 2, mode_b))
+
+            values = list(map(OP_FN[op], x, y))
+
+            if op in (Op.LESS_THEN, Op.EQUAL):
+                values = list(map(int, values))
+
+            self._store(lanes, self._addresses(lanes, pc + 3, mode_c), values)
+
+            return pc + 4
+
+        if op in (Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE):
+            y = self._load(lanes, self._addresses(lanes, pc + 2, mode_b))
+
+            jump = op == Op.JUMP_IF_TRUE
+
+            return uniform([j if (i != 0) == jump else pc + 3 for i, j in zip(x, y)])
+
+        if op == Op.ADJUST:
+            for lane, value in zip(lanes, x):
+                self._relative_base[lane] += value
+
+            return pc + 2
+
+        for lane, value in zip(lanes, x):
+            self._output[lane].append(value)
+
+        return pc + 2
+
+    def _read_input(
+        self, lanes: list[int], pc: int, addresses: Addresses
+    ) -> list[int | None]:
+        if isinstance(addresses, int):
+            addresses = [addresses] * len(lanes)
+
+        targets: list[int | None] = []
+
+        for lane, i in zip(lanes, addresses):
+            if not self._input[lane]:
+                targets.append(None)
+                continue
+
+            self._column(i)[lane] = self._input[lane].popleft()
+
+            targets.append(pc + 2)
+
+        return targets
@@ -0,0 +1,59 @@
+import array
+import hashlib
+import mmap
+import os
+
+MAGIC = b"ICPC\x00\x00\x00\x00"
+
+CACHE_DIR = "INTCODE_CACHE_DIR"
+
+UNCACHEABLE: set[str] = set()
+
+
+def path_for(input: str, directory: str) -> str:
+    key = hashlib.sha256(input.strip().encode()).hexdigest()
+
+    return os.path.join(directory, f"{key}.program")
+
+
+def store(input: str, path: str) -> None:
+    image = array.array("q", map(int, input.strip().split(",")))
+
+    temporary = f"{path}.{os.getpid()}"
+
+    with open(temporary, "wb") as file:
+        file.write(MAGIC)
+        image.tofile(file)
+
+    os.replace(temporary, path)
+
+
+def _map(path: str) -> memoryview:
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapped[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an intcode program image")
+
+    return memoryview(mapped)[len(MAGIC) :].cast("q")
+
+
+def load(input: str, directory: str) -> memoryview:
+    path = path_for(input, directory)
+
+    if path in UNCACHEABLE:
+        raise OverflowError(f"{path} does not fit in int64")
+
+    if os.path.exists(path):
+        try:
+            return _map(path)
+        except (TypeError, ValueError):
+            pass
+
+    try:
+        store(input, path)
+    except OverflowError:
+        UNCACHEABLE.add(path)
+        raise
+
+    return _map(path)
@@ -0,0 +1,233 @@
+import collections
+import dataclasses
+from typing import NamedTuple, Sequence
+
+from .instruction import SIZE, Instruction, Op, ParameterMode, decode
+
+STORES = {
+    Op.ADD: 2,
+    Op.MUL: 2,
+    Op.INPUT: 0,
+    Op.LESS_THEN: 2,
+    Op.EQUAL: 2,
+}
+
+JUMPS = {
+    Op.JUMP_IF_TRUE: True,
+    Op.JUMP_IF_FALSE: False,
+}
+
+
+class Operation(NamedTuple):
+    address: int
+    instruction: Instruction
+    operands: tuple[int, ...]
+
+    @property
+    def op(self) -> Op:
+        return self.instruction.op
+
+    @property
+    def modes(self) -> tuple[ParameterMode, ParameterMode, ParameterMode]:
+        return self.instruction.a, self.instruction.b, self.instruction.c
+
+    @property
+    def end(self) -> int:
+        return self.address + SIZE[self.op]
+
+    @property
+    def store(self) -> tuple[ParameterMode, int] | None:
+        if (i := STORES.get(self.op)) is None:
+            return None
+
+        return self.modes[i], self.operands[i]
+
+    @property
+    def target(self) -> int | None:
+        if self.op not in JUMPS or self.instruction.b != ParameterMode.IMMEDIATE:
+            return None
+
+        return self.operands[1]
+
+    @property
+    def indirect(self) -> bool:
+        return self.op in JUMPS and self.instruction.b != ParameterMode.IMMEDIATE
+
+    def successors(self) -> list[int]:
+        if self.op == Op.HALT:
+            return []
+
+        if self.op not in JUMPS:
+            return [self.end]
+
+        if self.instruction.a == ParameterMode.IMMEDIATE:
+            taken = bool(self.operands[0]) == JUMPS[self.op]
+
+            if not taken:
+                return [self.end]
+
+            return [] if self.target is None else [self.target]
+
+        return [self.end] if self.target is None else [self.end, self.target]
+
+    def __str__(self) -> str:
+        operands = []
+
+        for mode, value in zip(self.modes, self.operands):
+            if mode == ParameterMode.IMMEDIATE:
+                operands.append(str(value))
+            elif mode == ParameterMode.RELATIVE:
+                operands.append(f"[rb{value:+}]")
+            else:
+                operands.append(f"[{value}]")
+
+        return f"{self.address:>6}: {self.op.name:<14} {', '.join(operands)}".rstrip()
+
+
+@dataclasses.dataclass
+class BasicBlock:
+    start: int
+    end: int
+    operations: list[Operation]
+    successors: list[int]
+    indirect: bool
+
+
+@dataclasses.dataclass
+class ControlFlowGraph:
+    size: int
+    operations: dict[int, Operation]
+    blocks: dict[int, BasicBlock]
+    writes: dict[int, set[int]]
+    relative_writes: set[int]
+
+    @property
+    def code(self) -> set[int]:
+        return {
+            address
+            for operation in self.operations.values()
+            for address in range(operation.address, operation.end)
+        }
+
+    @property
+    def self_modifying(self) -> dict[int, set[int]]:
+        code = self.code
+
+        return {
+            address: sites for address, sites in self.writes.items() if address in code
+        }
+
+    def data(self) -> list[tuple[int, int]]:
+        code = self.code
+        ranges: list[tuple[int, int]] = []
+
+        for address in range(self.size):
+            if address in code:
+                continue
+
+            if ranges and ranges[-1][1] == address:
+                ranges[-1] = (ranges[-1][0], address + 1)
+            else:
+                ranges.append((address, address + 1))
+
+        return ranges
+
+    def listing(self, memory: list[int]) -> str:
+        lines = []
+        address = 0
+
+        while address < self.size:
+            if (operation := self.operations.get(address)) is not None:
+                if address in self.blocks:
+                    lines.append(f"block_{address}:")
+
+                lines.append(str(operation))
+                address = operation.end
+            else:
+                lines.append(f"{address:>6}: {'DATA':<14} {memory[address]}")
+                address += 1
+
+        return "\n".join(lines)
+
+
+def disassemble_at(memory: Sequence[int], address: int) -> Operation | None:
+    try:
+        instruction = decode(memory[address])
+    except ValueError:
+        return None
+
+    end = address + SIZE[instruction.op]
+
+    if end > len(memory):
+        return None
+
+    return Operation(address, instruction, tuple(memory[address + 1 : end]))
+
+
+def disassemble(memory: list[int], entries: tuple[int, ...] = (0,)) -> ControlFlowGraph:
+    operations: dict[int, Operation] = {}
+    leaders = set(entries)
+    queue = collections.deque(entries)
+
+    while queue:
+        address = queue.popleft()
+
+        if address in operations or not 0 <= address < len(memory):
+            continue
+
+        if (operation := disassemble_at(memory, address)) is None:
+            continue
+
+        operations[address] = operation
+
+        successors = operation.successors()
+
+        if operation.op in JUMPS:
+            leaders.update(successors)
+
+        queue.extend(successors)
+
+    writes: dict[int, set[int]] = collections.defaultdict(set)
+    relative_writes: set[int] = set()
+
+    for operation in operations.values():
+        if (store := operation.store) is None:
+            continue
+
+        mode, value = store
+
+        if mode == ParameterMode.POSITION:
+            writes[value].add(operation.address)
+        elif mode == ParameterMode.RELATIVE:
+            relative_writes.add(operation.address)
+
+    blocks: dict[int, BasicBlock] = {}
+
+    for start in sorted(leaders & operations.keys()):
+        block: list[Operation] = []
+        address = start
+
+        while (operation := operations.get(address)) is not None:
+            block.append(operation)
+
+            if operation.op in JUMPS or operation.op == Op.HALT:
+                break
+
+            address = operation.end
+
+            if address in leaders:
+                break
+
+        last = block[-1]
+
+        blocks[start] = BasicBlock(
+            start,
+            last.end,
+            block,
+            [i for i in last.successors() if i in operations],
+            last.indirect,
+        )
+
+    return ControlFlowGraph(
+        len(memory), operations, blocks, dict(writes), relative_writes
+    )
@@ -0,0 +1,34 @@
+import itertools
+from typing import Iterable, Iterator, TypeAlias
+
+from .memory import OFFSET
+from .snapshot import PAGE_BITS, Snapshot, paginate
+
+
+class ProgramImage:
+    def __init__(self, opcodes: Iterable[int]) -> None:
+        memory = list(opcodes)
+
+        self._size = len(memory)
+        self._snapshot = Snapshot(paginate(memory), 0, 0, (), (), False)
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, address: int) -> int:
+        if not 0 <= address < self._size:
+            raise IndexError(address)
+
+        return self._snapshot.pages[address >> PAGE_BITS][address & OFFSET]
+
+    def __iter__(self) -> Iterator[int]:
+        pages = itertools.chain.from_iterable(self._snapshot.pages)
+
+        return itertools.islice(pages, self._size)
+
+
+Program: TypeAlias = list[int] | ProgramImage
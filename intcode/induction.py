@@ -0,0 +1,183 @@
+import operator
+from typing import Callable, NamedTuple, Sequence
+
+from .disassembler import JUMPS, Operation, disassemble_at
+from .instruction import Op, ParameterMode
+from .jit import BlockFn
+from .memory import Pages, read, write
+
+MAX_TRIPS = 1 << 64
+
+
+class Cell(NamedTuple):
+    mode: ParameterMode
+    value: int
+
+    def address(self, relative_base: int) -> int:
+        if self.mode == ParameterMode.RELATIVE:
+            return relative_base + self.value
+
+        return self.value
+
+
+class Loop(NamedTuple):
+    start: int
+    end: int
+    counter: Cell
+    step: int
+    flag: Cell | None
+    compare: Callable[[int, int], bool]
+    bound: int
+    swapped: bool
+    continues: bool
+
+    def holds(self, x: int) -> bool:
+        if self.swapped:
+            return self.compare(self.bound, x)
+
+        return self.compare(x, self.bound)
+
+    def trips(self, x: int) -> int | None:
+        k = self.step
+
+        if self.holds(x + k) != self.continues:
+            return 1
+
+        if k == 0:
+            return None
+
+        if self.compare is operator.eq or self.compare is operator.ne:
+            if self.holds(self.bound) == self.continues:
+                return 2
+
+            if (self.bound - x) % k or (self.bound - x) // k < 1:
+                return None
+
+            return (self.bound - x) // k
+
+        low, high = 1, 2
+
+        while self.holds(x + high * k) == self.continues:
+            low, high = high, high * 2
+
+            if high > MAX_TRIPS:
+                return None
+
+        while low + 1 < high:
+            middle = (low + high) // 2
+
+            if self.holds(x + middle * k) == self.continues:
+                low = middle
+            else:
+                high = middle
+
+        return high
+
+    def wrap(self, body: BlockFn) -> BlockFn:
+        counter, flag, step, end = self.counter, self.flag, self.step, self.end
+
+        def block(
+            m: Pages, rb: int, code: dict[int, set[int]]
+        ) -> tuple[int, int, int | None]:
+            address = counter.address(rb)
+            target = address if flag is None else flag.address(rb)
+
+            if address in code or target in code:
+                return body(m, rb, code)
+
+            if flag is not None and target == address:
+                return body(m, rb, code)
+
+            if (n := self.trips(read(m, address))) is None:
+                return body(m, rb, code)
+
+            x = read(m, address) + n * step
+
+            write(m, address, x)
+
+            if flag is not None:
+                write(m, target, int(self.holds(x)))
+
+            return end, rb, None
+
+        return block
+
+
+def _cell(operation: Operation, index: int) -> Cell:
+    return Cell(operation.modes[index], operation.operands[index])
+
+
+def find_loop(memory: Sequence[int], start: int) -> Loop | None:
+    operations: list[Operation] = []
+    address = start
+
+    while len(operations) < 3:
+        if address >= len(memory):
+            return None
+
+        if (operation := disassemble_at(memory, address)) is None:
+            return None
+
+        operations.append(operation)
+        address = operation.end
+
+        if operation.op in JUMPS:
+            break
+
+    *body, jump = operations
+
+    if jump.op not in JUMPS or jump.target != start or not body:
+        return None
+
+    add, *rest = body
+
+    if add.op != Op.ADD or add.store is None:
+        return None
+
+    counter = Cell(*add.store)
+
+    if counter.mode == ParameterMode.IMMEDIATE:
+        return None
+
+    if _cell(add, 0) == counter and add.modes[1] == ParameterMode.IMMEDIATE:
+        step = add.operands[1]
+    elif _cell(add, 1) == counter and add.modes[0] == ParameterMode.IMMEDIATE:
+        step = add.operands[0]
+    else:
+        return None
+
+    continues = JUMPS[jump.op]
+
+    if not rest:
+        if _cell(jump, 0) != counter:
+            return None
+
+        return Loop(
+            start, jump.end, counter, step, None, operator.ne, 0, False, continues
+        )
+
+    (compare,) = rest
+
+    if compare.op not in (Op.LESS_THEN, Op.EQUAL) or compare.store is None:
+        return None
+
+    flag = Cell(*compare.store)
+
+    if flag == counter or flag.mode == ParameterMode.IMMEDIATE:
+        return None
+
+    if _cell(jump, 0) != flag:
+        return None
+
+    if _cell(compare, 0) == counter and compare.modes[1] == ParameterMode.IMMEDIATE:
+        bound, swapped = compare.operands[1], False
+    elif _cell(compare, 1) == counter and compare.modes[0] == ParameterMode.IMMEDIATE:
+        bound, swapped = compare.operands[0], True
+    else:
+        return None
+
+    function = operator.lt if compare.op == Op.LESS_THEN else operator.eq
+
+    return Loop(
+        start, jump.end, counter, step, flag, function, bound, swapped, continues
+    )
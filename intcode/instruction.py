@@ -0,0 +1,68 @@
+import enum
+import operator
+from typing import NamedTuple
+
+
+class Op(enum.IntEnum):
+    ADD = 1
+    MUL = 2
+    INPUT = 3
+    OUTPUT = 4
+    JUMP_IF_TRUE = 5
+    JUMP_IF_FALSE = 6
+    LESS_THEN = 7
+    EQUAL = 8
+    ADJUST = 9
+    HALT = 99
+
+
+class ParameterMode(enum.IntEnum):
+    POSITION = 0
+    IMMEDIATE = 1
+    RELATIVE = 2
+
+
+class Instruction(NamedTuple):
+    op: Op
+    a: ParameterMode
+    b: ParameterMode
+    c: ParameterMode
+
+
+DECODED: dict[int, Instruction] = {}
+
+
+def decode(word: int) -> Instruction:
+    if (instruction := DECODED.get(word)) is None:
+        instruction = DECODED[word] = Instruction(
+            Op(word % 100),
+            ParameterMode(word // 100 % 10),
+            ParameterMode(word // 1_000 % 10),
+            ParameterMode(word // 10_000 % 10),
+        )
+
+    return instruction
+
+
+SIZE = {
+    Op.ADD: 4,
+    Op.MUL: 4,
+    Op.INPUT: 2,
+    Op.OUTPUT: 2,
+    Op.JUMP_IF_TRUE: 3,
+    Op.JUMP_IF_FALSE: 3,
+    Op.LESS_THEN: 4,
+    Op.EQUAL: 4,
+    Op.ADJUST: 2,
+    Op.HALT: 1,
+}
+
+
+OP_FN = {
+    Op.ADD: operator.add,
+    Op.MUL: operator.mul,
+    Op.JUMP_IF_TRUE: operator.ne,
+    Op.JUMP_IF_FALSE: operator.eq,
+    Op.LESS_THEN: operator.lt,
+    Op.EQUAL: operator.eq,
+}
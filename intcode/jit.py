@@ -0,0 +1,186 @@
+from types import CodeType
+from typing import Callable, NamedTuple, Sequence, TypeAlias
+
+from .instruction import SIZE, Op, ParameterMode, decode
+from .memory import OFFSET, Pages
+from .snapshot import PAGE_BITS, PAGE_SIZE
+
+BlockFn: TypeAlias = Callable[
+    [Pages, int, dict[int, set[int]]], tuple[int, int, int | None]
+]
+
+
+class Block(NamedTuple):
+    start: int
+    end: int
+    extent: int
+    reach: int | None
+    steps: int
+    fn: BlockFn
+
+
+MAX_BLOCK_SIZE = 64
+
+COMPILED: dict[str, CodeType] = {}
+
+BINARY = {
+    Op.ADD: "{} + {}",
+    Op.MUL: "{} * {}",
+    Op.LESS_THEN: "1 if {} < {} else 0",
+    Op.EQUAL: "1 if {} == {} else 0",
+}
+
+
+class _Emitter:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.extent = -1
+        self.reach: int | None = None
+        self.delta = 0
+        self.scratch: tuple[str, int] | None = None
+        self.pages: dict[int, bool] = {}
+
+    def read(self, mode: ParameterMode, value: int) -> str:
+        if mode == ParameterMode.IMMEDIATE:
+            return str(value)
+
+        return self.cell(self.address(mode, value))
+
+    def address(self, mode: ParameterMode, value: int) -> str:
+        if mode == ParameterMode.RELATIVE:
+            offset = self.delta + value
+
+            self.reach = offset if self.reach is None else max(self.reach, offset)
+
+            return f"rb + {value}"
+
+        self.extent = max(self.extent, value)
+
+        return str(value)
+
+    def cell(self, address: str) -> str:
+        if address.isdigit():
+            index, offset = divmod(int(address), PAGE_SIZE)
+
+            self.pages.setdefault(index, False)
+
+            return f"p{index}[{offset}]"
+
+        return f"m[({address}) >> {PAGE_BITS}][({address}) & {OFFSET}]"
+
+    def write(self, address: str, expression: str, pc: int, next_pc: int) -> None:
+        if address.isdigit():
+            self.pages[int(address) // PAGE_SIZE] = True
+
+            target, name = self.cell(address), address
+        else:
+            page = f"m[c >> {PAGE_BITS}]"
+
+            self.lines.append(f"c = {address}")
+            self.lines.append(f"g = {page}")
+            self.lines.append(
+                f"if g.__class__ is tuple: {page} = list(g); return {pc}, rb, None"
+            )
+
+            target, name = f"g[c & {OFFSET}]", "c"
+
+        self.scratch = self.cell(address), len(self.lines)
+        self.lines.append(f"{target} = {expression}")
+        self.lines.append(f"if {name} in code: return {next_pc}, rb, {name}")
+
+    def body(self) -> list[str]:
+        lines = []
+
+        for index, written in sorted(self.pages.items()):
+            lines.append(f"p{index} = m[{index}]")
+
+            if written:
+                lines.append(
+                    f"if p{index}.__class__ is tuple: p{index} = m[{index}] = list(p{index})"
+                )
+
+        return lines + self.lines
+
+    def fuse(self, condition: str, scratch: tuple[str, int] | None) -> str:
+        if scratch is None or scratch[0] != condition:
+            return condition
+
+        _, line = scratch
+
+        self.lines[line] = f"v = {self.lines[line]}"
+
+        return "v"
+
+
+def compile_block(memory: Sequence[int], start: int) -> Block | None:
+    emitter = _Emitter()
+
+    pc = start
+    steps = 0
+
+    while len(emitter.lines) < MAX_BLOCK_SIZE:
+        scratch, emitter.scratch = emitter.scratch, None
+
+        try:
+            op, mode_a, mode_b, mode_c = decode(memory[pc])
+        except (IndexError, ValueError):
+            break
+
+        size = SIZE[op]
+
+        if op in (Op.INPUT, Op.OUTPUT, Op.HALT) or pc + size > len(memory):
+            break
+
+        a, b, c = [*memory[pc + 1 : pc + size], 0, 0][:3]
+
+        steps += 1
+
+        if op in BINARY:
+            if mode_c == ParameterMode.IMMEDIATE:
+                mode_c, c = ParameterMode.POSITION, pc + 3
+
+            expression = BINARY[op].format(
+                emitter.read(mode_a, a), emitter.read(mode_b, b)
+            )
+
+            emitter.write(emitter.address(mode_c, c), expression, pc, pc + size)
+        elif op == Op.ADJUST:
+            emitter.lines.append(f"rb += {emitter.read(mode_a, a)}")
+
+            if mode_a != ParameterMode.IMMEDIATE:
+                pc += size
+                break
+
+            emitter.delta += a
+        else:
+            condition = emitter.fuse(emitter.read(mode_a, a), scratch)
+
+            if op == Op.JUMP_IF_FALSE:
+                condition = f"not {condition}"
+
+            emitter.lines.append(
+                f"if {condition}: return {emitter.read(mode_b, b)}, rb, None"
+            )
+
+            pc += size
+            break
+
+        pc += size
+
+    if pc == start:
+        return None
+
+    emitter.lines.append(f"return {pc}, rb, None")
+
+    source = "def block(m, rb, code):\n" + "".join(
+        f"    {line}\n" for line in emitter.body()
+    )
+
+    if (code := COMPILED.get(source)) is None:
+        code = COMPILED[source] = compile(source, "<intcode block>", "exec")
+
+    namespace: dict[str, BlockFn] = {}
+
+    exec(code, namespace)
+
+    return Block(start, pc, emitter.extent, emitter.reach, steps, namespace["block"])
@@ -0,0 +1,113 @@
+import collections
+import hashlib
+import sqlite3
+from typing import Iterable
+
+from .image import Program
+from .vm import VM
+
+Outputs = tuple[int, ...]
+
+
+def digest(opcodes: Iterable[int]) -> str:
+    return hashlib.sha256(",".join(map(str, opcodes)).encode()).hexdigest()
+
+
+class Memo:
+    def __init__(
+        self, opcodes: Program, maxsize: int = 4096, path: str | None = None
+    ) -> None:
+        self._opcodes = opcodes
+        self._digest = digest(opcodes)
+        self._maxsize = maxsize
+        self._cache: collections.OrderedDict[tuple[int, ...], Outputs] = (
+            collections.OrderedDict()
+        )
+        self._db: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS runs"
+                " (program TEXT, inputs TEXT, outputs TEXT,"
+                " PRIMARY KEY (program, inputs))"
+            )
+
+    def __enter__(self) -> "Memo":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def run(self, *inputs: int) -> Outputs:
+        if (outputs := self._cache.get(inputs)) is not None:
+            self._cache.move_to_end(inputs)
+            self.hits += 1
+
+            return outputs
+
+        if (outputs := self._load(inputs)) is not None:
+            self.hits += 1
+        else:
+            outputs = self._execute(inputs)
+            self.misses += 1
+
+            self._store(inputs, outputs)
+
+        self._cache[inputs] = outputs
+
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+        return outputs
+
+    def _execute(self, inputs: tuple[int, ...]) -> Outputs:
+        vm = VM(self._opcodes)
+
+        for i in inputs:
+            vm.send(i)
+
+        outputs = []
+
+        for value in vm:
+            if value is None:
+                raise ValueError(f"program needs more than {len(inputs)} inputs")
+
+            outputs.append(value)
+
+        return tuple(outputs)
+
+    def _load(self, inputs: tuple[int, ...]) -> Outputs | None:
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT outputs FROM runs WHERE program = ? AND inputs = ?",
+            (self._digest, ",".join(map(str, inputs))),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return tuple(map(int, row[0].split(","))) if row[0] else ()
+
+    def _store(self, inputs: tuple[int, ...], outputs: Outputs) -> None:
+        if self._db is None:
+            return
+
+        self._db.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?)",
+            (
+                self._digest,
+                ",".join(map(str, inputs)),
+                ",".join(map(str, outputs)),
+            ),
+        )
+        self._db.commit()
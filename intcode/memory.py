@@ -0,0 +1,76 @@
+import itertools
+from typing import Iterator, Sequence, TypeAlias, overload
+
+from .snapshot import PAGE_BITS, PAGE_SIZE, ZERO, Page
+
+Pages: TypeAlias = list[Page | list[int]]
+
+OFFSET = PAGE_SIZE - 1
+
+
+def grow(pages: Pages, size: int) -> None:
+    count = -(-size // PAGE_SIZE)
+
+    pages.extend([ZERO] * (max(count, 2 * len(pages)) - len(pages)))
+
+
+def read(pages: Pages, address: int) -> int:
+    if address >> PAGE_BITS >= len(pages):
+        return 0
+
+    return pages[address >> PAGE_BITS][address & OFFSET]
+
+
+def write(pages: Pages, address: int, value: int) -> None:
+    index = address >> PAGE_BITS
+
+    if index >= len(pages):
+        grow(pages, address + 1)
+
+    page = pages[index]
+
+    if isinstance(page, tuple):
+        page = pages[index] = list(page)
+
+    page[address & OFFSET] = value
+
+
+def freeze(pages: Pages) -> tuple[Page, ...]:
+    frozen = []
+
+    for i, page in enumerate(pages):
+        if isinstance(page, list):
+            page = pages[i] = tuple(page)
+
+        frozen.append(page)
+
+    return tuple(frozen)
+
+
+class Memory(Sequence[int]):
+    def __init__(self, pages: Pages) -> None:
+        self._pages = pages
+
+    def __len__(self) -> int:
+        return len(self._pages) * PAGE_SIZE
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        return read(self._pages, index)
+
+    def __setitem__(self, address: int, value: int) -> None:
+        write(self._pages, address, value)
+
+    def __iter__(self) -> Iterator[int]:
+        return itertools.chain.from_iterable(self._pages)
@@ -0,0 +1,89 @@
+import collections
+import dataclasses
+import time
+
+from .instruction import SIZE, Op
+
+
+@dataclasses.dataclass
+class Profile:
+    image_size: int = 0
+    opcodes: collections.Counter[Op] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    addresses: collections.Counter[int] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    instructions: dict[int, Op] = dataclasses.field(default_factory=dict)
+    io: list[tuple[float, int]] = dataclasses.field(default_factory=list)
+    outside_reads: int = 0
+    last_io: float = dataclasses.field(default_factory=time.perf_counter)
+    since_io: int = 0
+
+    def execute(self, pc: int, op: Op) -> None:
+        self.opcodes[op] += 1
+        self.addresses[pc] += 1
+        self.instructions[pc] = op
+        self.since_io += 1
+
+    def read(self, address: int) -> None:
+        if address >= self.image_size:
+            self.outside_reads += 1
+
+    def io_event(self) -> None:
+        now = time.perf_counter()
+
+        self.io.append((now - self.last_io, self.since_io))
+
+        self.last_io = now
+        self.since_io = 0
+
+    def hot_ranges(self) -> list[tuple[int, int, int]]:
+        ranges: list[tuple[int, int, int]] = []
+        previous = 0
+
+        for pc in sorted(self.addresses):
+            end = pc + SIZE[self.instructions[pc]]
+            count = self.addresses[pc]
+
+            if ranges and ranges[-1][1] == pc and count == previous:
+                start, _, total = ranges[-1]
+                ranges[-1] = (start, end, total + count)
+            else:
+                ranges.append((pc, end, count))
+
+            previous = count
+
+        return sorted(ranges, key=lambda i: i[2], reverse=True)
+
+    def report(self, top: int = 10) -> str:
+        total = sum(self.opcodes.values()) or 1
+
+        lines = [f"instructions: {total}", "", "opcodes:"]
+
+        for op, count in self.opcodes.most_common():
+            lines.append(f"  {op.name:<14} {count:>12} {count / total:>7.1%}")
+
+        lines += ["", "hot ranges:"]
+
+        for start, end, count in self.hot_ranges()[:top]:
+            lines.append(f"  {start:>6}-{end - 1:<6} {count:>12} {count / total:>7.1%}")
+
+        lines.append("")
+
+        if self.io:
+            seconds = [i for i, _ in self.io]
+            steps = [i for _, i in self.io]
+
+            lines.append(
+                f"io: {len(self.io)} events, "
+                f"{sum(seconds) / len(seconds) * 1000:.3f}ms "
+                f"and {sum(steps) / len(steps):.0f} instructions between events, "
+                f"max {max(seconds) * 1000:.3f}ms / {max(steps)} instructions"
+            )
+        else:
+            lines.append("io: no events")
+
+        lines.append(f"reads outside image: {self.outside_reads}")
+
+        return "\n".join(lines)
@@ -0,0 +1,36 @@
+import dataclasses
+import itertools
+from typing import Sequence, TypeAlias
+
+PAGE_BITS = 8
+
+PAGE_SIZE = 1 << PAGE_BITS
+
+Page: TypeAlias = tuple[int, ...]
+
+ZERO: Page = (0,) * PAGE_SIZE
+
+
+@dataclasses.dataclass(frozen=True)
+class Snapshot:
+    pages: tuple[Page, ...]
+    pc: int
+    relative_base: int
+    input: tuple[int, ...]
+    output: tuple[int, ...]
+    halted: bool
+
+    @property
+    def memory(self) -> list[int]:
+        return list(itertools.chain.from_iterable(self.pages))
+
+
+def paginate(memory: Sequence[int]) -> tuple[Page, ...]:
+    pages: list[Page] = []
+
+    for start in range(0, len(memory), PAGE_SIZE):
+        page = tuple(memory[start : start + PAGE_SIZE])
+
+        pages.append(page + ZERO[len(page) :])
+
+    return tuple(pages)
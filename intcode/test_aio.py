@@ -0,0 +1,51 @@
+import asyncio
+
+from .aio import AsyncVM, ring, run_all
+from .vm import parse_input
+
+DOUBLER = parse_input("3,11,1,11,11,11,4,11,1105,1,0,0")
+
+
+def test_channels():
+    async def main() -> list[int]:
+        vm = AsyncVM(DOUBLER)
+
+        task = asyncio.create_task(vm.run())
+
+        outputs = []
+
+        for i in range(3):
+            await vm.input.put(i)
+
+            outputs.append(await vm.output.get())
+
+        task.cancel()
+
+        return outputs
+
+    assert asyncio.run(main()) == [0, 2, 4]
+
+
+def test_pipeline():
+    async def main() -> int:
+        first = AsyncVM(parse_input("3,0,1002,0,3,0,4,0,99"))
+        second = AsyncVM(parse_input("3,0,1001,0,4,0,4,0,99"), first.output)
+
+        await first.input.put(5)
+        await asyncio.gather(first.run(), second.run())
+
+        return second.output.get_nowait()
+
+    assert asyncio.run(main()) == 19
+
+
+def test_ring():
+    async def main() -> int:
+        vms = ring(parse_input("3,0,1001,0,1,0,4,0,3,0,1001,0,1,0,4,0,99"), 3)
+
+        await vms[0].input.put(0)
+        await run_all(vms)
+
+        return vms[0].input.get_nowait()
+
+    assert asyncio.run(main()) == 6
@@ -0,0 +1,19 @@
+from .ascii import Channel, Reply
+from .vm import VM, parse_input
+
+ECHO = "3,100,4,100,1008,100,10,101,1006,101,0,104,1000,99"
+
+
+def test_command():
+    channel = Channel(VM(parse_input(ECHO)))
+
+    reply = channel.fork().command("hi")
+
+    assert reply == Reply("hi\n", 1000)
+    assert reply.lines == ["hi"]
+
+    channel.write(b"a")
+
+    assert channel.read() == Reply("a")
+    assert channel.command("b\nc") == Reply("b\n", 1000)
+    assert channel.vm.halted
@@ -0,0 +1,52 @@
+import itertools
+
+from .batch import BatchVM
+from .vm import VM, parse_input
+
+LARGER = "3,21,1008,21,8,20,1005,20,22,107,8,21,20,1006,20,31,1106,0,36,98,0,0,1002,21,125,20,4,20,1105,1,46,104,999,1105,1,46,1101,1000,1,20,4,20,1105,1,46,98,99"
+
+
+def run(opcodes: list[int], inputs: tuple[int, ...]) -> list[int | None]:
+    vm = VM(opcodes)
+
+    for i in inputs:
+        vm.send(i)
+
+    return list(vm)
+
+
+def test_divergent_lanes():
+    opcodes = parse_input(LARGER)
+    inputs = [(i,) for i in range(16)]
+
+    assert BatchVM(opcodes, inputs).run() == [run(opcodes, i) for i in inputs]
+
+
+def test_relative_base():
+    opcodes = parse_input("3,200,109,5,22101,3,195,2,204,2,99")
+    inputs = [(i,) for i in range(4)]
+
+    assert BatchVM(opcodes, inputs).run() == [[3], [4], [5], [6]]
+
+
+def test_memory():
+    opcodes = parse_input("1,0,0,0,99")
+    pairs = list(itertools.product(range(5), repeat=2))
+
+    vm = BatchVM(opcodes, [()] * len(pairs))
+    vm.memory[1][:] = [noun for noun, _ in pairs]
+    vm.memory[2][:] = [verb for _, verb in pairs]
+
+    assert vm.run() == [[]] * len(pairs)
+
+    for (noun, verb), zero in zip(pairs, vm.memory[0]):
+        memory = opcodes[:]
+        memory[1:3] = noun, verb
+
+        assert zero == memory[noun] + memory[verb]
+
+
+def test_missing_input():
+    vm = BatchVM(parse_input("3,0,3,1,4,1,99"), [(1, 2), (3,)])
+
+    assert vm.run() == [[2], []]
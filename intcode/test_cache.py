@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from . import cache
+from .cache import MAGIC, load, path_for
+from .vm import parse_input
+
+PROGRAM = "1002,4,3,4,33\n"
+
+
+def test_load(tmp_path):
+    image = load(PROGRAM, str(tmp_path))
+
+    assert image.tolist() == [1002, 4, 3, 4, 33]
+    assert os.path.exists(path_for(PROGRAM, str(tmp_path)))
+    assert load(PROGRAM, str(tmp_path)).tolist() == image.tolist()
+
+
+def test_parse_input(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTCODE_CACHE_DIR", str(tmp_path))
+
+    assert parse_input(PROGRAM) == [1002, 4, 3, 4, 33]
+    assert parse_input(PROGRAM) == [1002, 4, 3, 4, 33]
+    assert parse_input("1,-1," + "9" * 30) == [1, -1, int("9" * 30)]
+
+    assert len(os.listdir(tmp_path)) == 1
+
+
+@pytest.mark.parametrize("content", [b"", MAGIC[:3], MAGIC + b"\x01\x02", b"x" * 16])
+def test_load_damaged(tmp_path, content):
+    path = path_for(PROGRAM, str(tmp_path))
+
+    with open(path, "wb") as file:
+        file.write(content)
+
+    assert load(PROGRAM, str(tmp_path)).tolist() == [1002, 4, 3, 4, 33]
+    assert load(PROGRAM, str(tmp_path)).tolist() == [1002, 4, 3, 4, 33]
+
+
+def test_load_overflow(tmp_path, monkeypatch):
+    stored = []
+
+    def store(input, path):
+        stored.append(path)
+
+        raise OverflowError
+
+    monkeypatch.setattr(cache, "store", store)
+    monkeypatch.setattr(cache, "UNCACHEABLE", set())
+
+    for _ in range(3):
+        with pytest.raises(OverflowError):
+            load("1," + "9" * 30, str(tmp_path))
+
+    assert len(stored) == 1
@@ -0,0 +1,43 @@
+from .disassembler import disassemble
+from .instruction import Op
+from .vm import parse_input
+
+COUNTDOWN = "3,100,1001,100,-1,100,4,100,1005,100,2,99"
+
+
+def test_disassemble():
+    graph = disassemble(parse_input(COUNTDOWN))
+
+    assert [i.op for i in graph.operations.values()] == [
+        Op.INPUT,
+        Op.ADD,
+        Op.OUTPUT,
+        Op.JUMP_IF_TRUE,
+        Op.HALT,
+    ]
+
+    assert sorted(graph.blocks) == [0, 2, 11]
+    assert graph.blocks[0].successors == [2]
+    assert graph.blocks[2].successors == [11, 2]
+    assert graph.blocks[11].successors == []
+
+    assert graph.writes == {100: {0, 2}}
+    assert graph.self_modifying == {}
+    assert graph.data() == []
+
+    assert str(graph.operations[2]) == "     2: ADD            [100], -1, [100]"
+
+
+def test_data_and_self_modifying():
+    memory = parse_input("1101,7,0,6,1101,0,0,9,1105,1,12,42,21101,1,2,0,106,0,10")
+
+    graph = disassemble(memory)
+
+    assert graph.self_modifying == {6: {0}, 9: {4}}
+    assert graph.data() == [(11, 12)]
+    assert graph.relative_writes == {12}
+    assert sorted(graph.blocks) == [0, 12]
+    assert graph.blocks[12].indirect
+    assert graph.blocks[12].successors == []
+
+    assert "    11: DATA           42" in graph.listing(memory)
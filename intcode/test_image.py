@@ -0,0 +1,60 @@
+import pytest
+
+from .image import ProgramImage
+from .snapshot import PAGE_SIZE
+from .vm import VM, parse_input
+
+ACCUMULATOR = "3,100,1,100,101,101,4,101,1105,1,0"
+
+
+def test_image():
+    image = ProgramImage(range(PAGE_SIZE + 3))
+
+    assert len(image) == PAGE_SIZE + 3
+    assert image[PAGE_SIZE + 1] == PAGE_SIZE + 1
+    assert list(image) == list(range(PAGE_SIZE + 3))
+
+    with pytest.raises(IndexError):
+        image[PAGE_SIZE + 3]
+
+
+def test_shared_pages():
+    image = ProgramImage(parse_input(ACCUMULATOR))
+
+    vms = [VM(image, jit=bool(i % 2)) for i in range(4)]
+
+    for vm in vms:
+        assert all(a is b for a, b in zip(vm.snapshot().pages, image.snapshot.pages))
+
+    for i, vm in enumerate(vms):
+        vm.send(i)
+
+        assert next(vm) == i
+        assert vm.memory[101] == i
+
+    assert list(image) == parse_input(ACCUMULATOR)
+
+    idle = VM(image)
+    fork = idle.fork()
+
+    assert fork.snapshot().pages[0] is image.snapshot.pages[0]
+
+    fork.send(5)
+
+    assert next(fork) == 5
+    assert idle.memory[: len(image)] == parse_input(ACCUMULATOR)
+
+
+def test_copy_on_write():
+    image = ProgramImage(parse_input(ACCUMULATOR) + [0] * PAGE_SIZE * 8)
+
+    for i, jit in enumerate((False, True)):
+        vm = VM(image, jit=jit)
+        vm.send(i)
+
+        assert next(vm) == i
+
+        first, *rest = vm.snapshot().pages
+
+        assert first is not image.snapshot.pages[0]
+        assert all(a is b for a, b in zip(rest, image.snapshot.pages[1:]))
@@ -0,0 +1,55 @@
+from .induction import find_loop
+from .vm import VM, parse_input
+
+LOOPS = (
+    ("1101,0,{},20,1001,20,-1,20,1005,20,4,4,20,99,0,0,0,0,0,0,0,0", (1, 7, 36)),
+    (
+        "1101,0,{},20,1001,20,3,20,1007,20,100,21,1005,21,4,4,20,4,21,99,0,0",
+        (-9, 0, 1, 36, 200),
+    ),
+    (
+        "1101,0,{},20,101,7,20,20,107,-50,20,21,1006,21,4,4,20,4,21,99,0,0",
+        (-200, -9, 0),
+    ),
+    (
+        "1101,0,{},20,1001,20,2,20,1008,20,40,21,1006,21,4,4,20,4,21,99,0,0",
+        (-8, 0, 10, 38),
+    ),
+    (
+        "109,10,21101,0,{},10,21201,10,-5,10,22107,30,10,11,1205,11,6,204,10,99,0,0",
+        (0, 36, 100),
+    ),
+)
+
+
+def run(program: str, jit: bool) -> tuple[list[int | None], list[int]]:
+    vm = VM(parse_input(program), jit=jit)
+
+    return list(vm), vm.memory[:22]
+
+
+def test_find_loop():
+    program, _ = LOOPS[1]
+
+    loop = find_loop(parse_input(program.format(0)), 4)
+
+    assert loop is not None
+    assert (loop.start, loop.end, loop.step, loop.bound) == (4, 15, 3, 100)
+    assert loop.trips(0) == 34
+    assert loop.trips(200) == 1
+
+    assert find_loop(parse_input(program.format(0)), 0) is None
+
+
+def test_fast_forward():
+    for program, starts in LOOPS:
+        for start in starts:
+            source = program.format(start)
+
+            assert run(source, True) == run(source, False), source
+
+
+def test_closed_form():
+    program = "1101,0,0,20,1001,20,1,20,1007,20,1000000000,21,1005,21,4,4,20,99"
+
+    assert list(VM(parse_input(program + ",0,0,0,0"), jit=True)) == [1_000_000_000]
@@ -0,0 +1,82 @@
+from .jit import compile_block
+from .memory import read
+from .snapshot import paginate
+from .vm import VM, parse_input
+
+
+def run(program: str, *inputs: int) -> list[int | None]:
+    vm = VM(parse_input(program), jit=True)
+
+    for i in inputs:
+        vm.send(i)
+
+    return list(vm)
+
+
+def test_compile_block():
+    memory = parse_input("1101,1,2,8,1006,0,0,99,0")
+
+    pages = list(paginate(memory))
+
+    block = compile_block(memory, 0)
+
+    assert block is not None
+    assert (block.start, block.end) == (0, 7)
+    assert block.fn(pages, 0, {}) == (7, 0, None)
+    assert read(pages, 8) == 3
+
+    assert compile_block(memory, 7) is None
+
+
+def test_programs():
+    for program, in_value, expected in (
+        ("3,9,8,9,10,9,4,9,99,-1,8", 8, [1]),
+        ("3,9,7,9,10,9,4,9,99,-1,8", 9, [0]),
+        ("3,3,1108,-1,8,3,4,3,99", 8, [1]),
+        ("3,12,6,12,15,1,13,14,13,4,13,99,-1,0,1,9", 0, [0]),
+        ("3,3,1105,-1,9,1101,0,0,12,4,12,99,1", 10, [1]),
+        (
+            "3,21,1008,21,8,20,1005,20,22,107,8,21,20,1006,20,31,1106,0,36,98,0,0,1002,21,125,20,4,20,1105,1,46,104,999,1105,1,46,1101,1000,1,20,4,20,1105,1,46,98,99",
+            7,
+            [999],
+        ),
+        (
+            "3,21,1008,21,8,20,1005,20,22,107,8,21,20,1006,20,31,1106,0,36,98,0,0,1002,21,125,20,4,20,1105,1,46,104,999,1105,1,46,1101,1000,1,20,4,20,1105,1,46,98,99",
+            9,
+            [1001],
+        ),
+    ):
+        assert run(program, in_value) == expected
+
+
+def test_relative_base():
+    program = "109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99"
+
+    assert run(program) == list(map(int, program.split(",")))
+    assert run("1102,34915192,34915192,7,4,7,99,0") == [1219070632396864]
+    assert run("109,2000,21101,3,4,0,204,0,99") == [7]
+
+
+def test_self_modifying():
+    assert run("1101,100,-1,4,0") == []
+    assert run("1101,3,1,4,0,0,99") == [1101]
+
+    vm = VM(parse_input("1101,0,0,20,1001,2,1,2,4,20,1105,1,0"), jit=True)
+
+    assert [next(vm) for _ in range(3)] == [0, 1, 2]
+
+
+def test_fusion():
+    memory = parse_input("1001,9,-1,9,1005,9,0,99,0,3")
+
+    pages = list(paginate(memory))
+
+    block = compile_block(memory, 0)
+
+    assert block is not None
+    assert block.fn(pages, 0, {}) == (0, 0, None)
+    assert read(pages, 9) == 2
+
+    assert run(
+        "109,40,1101,0,5,30,1001,30,-1,30,1005,30,6,21107,2,3,0,1206,0,24,204,0,4,30,99"
+    ) == [1, 0]
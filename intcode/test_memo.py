@@ -0,0 +1,44 @@
+import pytest
+
+from .memo import Memo, digest
+from .vm import parse_input
+
+SUM = "3,11,3,12,1,11,12,13,4,13,99,0,0,0"
+
+
+def test_lru():
+    memo = Memo(parse_input(SUM), maxsize=2)
+
+    assert memo.run(1, 2) == (3,)
+    assert memo.run(1, 2) == (3,)
+    assert memo.run(2, 2) == (4,)
+    assert memo.run(3, 2) == (5,)
+    assert memo.run(1, 2) == (3,)
+
+    assert (memo.hits, memo.misses) == (1, 4)
+
+    with pytest.raises(ValueError):
+        memo.run(1)
+
+
+def test_disk(tmp_path):
+    path = str(tmp_path / "memo.sqlite")
+
+    with Memo(parse_input(SUM), path=path) as memo:
+        assert memo.run(1, 2) == (3,)
+
+    unclosed = Memo(parse_input(SUM), path=path)
+
+    assert unclosed.run(2, 2) == (4,)
+
+    with Memo(parse_input(SUM), path=path) as memo:
+        assert memo.run(2, 2) == (4,)
+        assert (memo.hits, memo.misses) == (1, 0)
+
+    unclosed.close()
+
+    with Memo(parse_input(SUM), path=path) as memo:
+        assert memo.run(1, 2) == (3,)
+        assert (memo.hits, memo.misses) == (1, 0)
+
+    assert digest(parse_input(SUM)) != digest(parse_input(SUM.replace("1,11", "2,11")))
@@ -0,0 +1,30 @@
+from .instruction import Op
+from .profiler import Profile
+from .vm import VM, parse_input
+
+COUNTDOWN = "3,100,1001,100,-1,100,4,100,1005,100,2,99"
+
+
+def test_profile():
+    profile = Profile()
+
+    vm = VM(parse_input(COUNTDOWN), profile=profile)
+    vm.send(3)
+
+    assert list(vm) == [2, 1, 0]
+
+    assert profile.image_size == 12
+    assert profile.opcodes[Op.INPUT] == 1
+    assert profile.opcodes[Op.ADD] == 3
+    assert profile.opcodes[Op.OUTPUT] == 3
+    assert profile.opcodes[Op.HALT] == 1
+    assert profile.addresses[2] == 3
+    assert profile.outside_reads == 9
+    assert len(profile.io) == 4
+
+    assert profile.hot_ranges() == [(2, 11, 9), (0, 2, 1), (11, 12, 1)]
+
+    report = profile.report()
+
+    assert "ADD" in report
+    assert "reads outside image: 9" in report
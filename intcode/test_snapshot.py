@@ -0,0 +1,86 @@
+import collections
+import itertools
+
+from .snapshot import PAGE_SIZE, paginate
+from .vm import VM, Status, parse_input
+
+ACCUMULATOR = "3,100,1,100,101,101,4,101,1105,1,0"
+
+
+def test_paginate():
+    pages = paginate(range(PAGE_SIZE * 2 + 1))
+
+    assert [len(page) for page in pages] == [PAGE_SIZE] * 3
+    assert pages[2][:2] == (PAGE_SIZE * 2, 0)
+
+
+def test_dirty_pages():
+    vm = VM(parse_input("1101,1,2,300,99") + [0] * PAGE_SIZE * 2)
+
+    snapshot = vm.snapshot()
+
+    assert list(vm) == []
+
+    changed = vm.snapshot()
+
+    assert changed.pages[0] is snapshot.pages[0]
+    assert changed.pages[1] is not snapshot.pages[1]
+    assert changed.pages[2] is snapshot.pages[2]
+    assert changed.memory[300] == 3
+    assert vm.snapshot().pages == changed.pages
+    assert all(a is b for a, b in zip(vm.snapshot().pages, changed.pages))
+
+
+def test_fork():
+    for jit in (False, True):
+        vm = VM(parse_input(ACCUMULATOR), jit=jit)
+        vm.send(1)
+
+        assert next(vm) == 1
+        assert next(vm) is None
+
+        fork = vm.fork()
+
+        vm.send(10)
+        fork.send(20)
+
+        assert next(vm) == 11
+        assert next(fork) == 21
+        assert vm.memory[101] == 11
+        assert fork.memory[101] == 21
+
+
+def test_restore():
+    vm = VM(parse_input(ACCUMULATOR))
+    vm.send(1)
+    vm.send(2)
+
+    assert next(vm) == 1
+
+    snapshot = vm.snapshot()
+
+    assert snapshot.input == (2,)
+    assert list(itertools.islice(vm, 2)) == [3, None]
+
+    vm.restore(snapshot)
+
+    assert list(itertools.islice(vm, 2)) == [3, None]
+    assert vm.snapshot().pages[0] is not snapshot.pages[0]
+    assert vm.fork().snapshot().pages[0] is vm.snapshot().pages[0]
+
+
+def test_pending_output():
+    vm = VM(parse_input("104,1,104,2,99"))
+
+    assert vm.run(10) == Status.HAS_OUTPUT
+
+    snapshot = vm.snapshot()
+
+    assert snapshot.output == (1,)
+    assert vm.fork().output == collections.deque([1])
+
+    assert vm.run(10) == Status.HAS_OUTPUT
+
+    vm.restore(snapshot)
+
+    assert vm.output == collections.deque([1])
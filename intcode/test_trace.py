@@ -0,0 +1,113 @@
+import pytest
+
+from .trace import Kind, Recorder, Replayer, Trace, traced
+from .vm import VM, parse_input
+
+ECHO = "3,13,1001,13,-5,13,4,13,1005,13,0,99,0,0"
+
+
+def record(opcodes: list[int], inputs: list[int], counts: bool = False) -> Trace:
+    recorder = Recorder(opcodes, counts=counts)
+
+    for i in inputs:
+        recorder.send(i)
+
+        list(recorder.outputs())
+
+    return recorder.trace
+
+
+def test_format():
+    opcodes = parse_input(ECHO)
+
+    trace = record(opcodes, [7, -3, 5], counts=True)
+
+    assert [kind for kind, _, _ in trace.events] == [
+        Kind.INPUT,
+        Kind.OUTPUT,
+        Kind.WAIT,
+        Kind.INPUT,
+        Kind.OUTPUT,
+        Kind.WAIT,
+        Kind.INPUT,
+        Kind.OUTPUT,
+        Kind.HALT,
+    ]
+
+    assert trace.events[4].value == -8
+    assert trace.events[1].instructions == 3
+
+    assert Trace.from_bytes(trace.to_bytes()) == trace
+
+    with pytest.raises(ValueError):
+        Trace.from_bytes(trace.to_bytes()[:-1])
+
+    with pytest.raises(ValueError):
+        Recorder(opcodes, counts=True, jit=True)
+
+
+def test_replay():
+    opcodes = parse_input(ECHO)
+
+    trace = record(opcodes, [7, 5])
+
+    replayer = Replayer(trace, opcodes)
+
+    replayer.send(7)
+    assert list(replayer.outputs()) == [2]
+
+    replayer.send(5)
+    assert list(replayer.outputs()) == [0]
+
+    assert replayer.halted and replayer.replaying
+
+
+def test_divergence():
+    opcodes = parse_input(ECHO)
+
+    replayer = Replayer(record(opcodes, [7, 5]), opcodes)
+
+    replayer.send(7)
+    assert list(replayer.outputs()) == [2]
+
+    replayer.send(9)
+    assert list(replayer.outputs()) == [4]
+    assert not replayer.replaying
+
+    replayer.send(5)
+    assert list(replayer.outputs()) == [0]
+    assert replayer.halted
+
+    with pytest.raises(ValueError):
+        Replayer(record(opcodes, [5]), parse_input(ECHO.replace("-5", "-6")))
+
+
+def test_traced(tmp_path, monkeypatch):
+    opcodes = parse_input(ECHO)
+
+    with traced(opcodes, "echo") as vm:
+        assert isinstance(vm, VM)
+
+    monkeypatch.setenv("INTCODE_TRACE_DIR", str(tmp_path))
+
+    with pytest.raises(KeyError):
+        with traced(opcodes, "echo") as vm:
+            assert isinstance(vm, Recorder)
+
+            vm.send(6)
+
+            assert next(vm) == 1
+
+            raise KeyError
+
+    with traced(opcodes, "echo") as vm:
+        assert isinstance(vm, Replayer)
+
+        vm.send(6)
+
+        assert next(vm) == 1
+        assert vm.replaying
+
+        vm.send(5)
+
+        assert list(vm) == [0]
@@ -0,0 +1,146 @@
+from .instruction import Instruction, Op, ParameterMode, decode
+from .profiler import Profile
+from .vm import VM, Status, parse_input
+
+
+def run(program: str, *inputs: int) -> list[int | None]:
+    vm = VM(parse_input(program))
+
+    for i in inputs:
+        vm.send(i)
+
+    return list(vm)
+
+
+def test_decode():
+    assert decode(1002) == Instruction(
+        Op.MUL,
+        ParameterMode.POSITION,
+        ParameterMode.IMMEDIATE,
+        ParameterMode.POSITION,
+    )
+    assert decode(21107) == Instruction(
+        Op.LESS_THEN,
+        ParameterMode.IMMEDIATE,
+        ParameterMode.IMMEDIATE,
+        ParameterMode.RELATIVE,
+    )
+    assert decode(99) is decode(99)
+
+
+def test_memory():
+    vm = VM(parse_input("1,9,10,3,2,3,11,0,99,30,40,50"))
+
+    assert list(vm) == []
+    assert vm.halted
+    assert vm.memory[0] == 3500
+
+
+def test_input_output():
+    program = "3,9,8,9,10,9,4,9,99,-1,8"
+
+    assert run(program, 8) == [1]
+    assert run(program, 5) == [0]
+
+
+def test_wait_for_input():
+    vm = VM(parse_input("3,0,4,0,99"))
+
+    assert next(vm) is None
+    assert next(vm) is None
+
+    vm.send(42)
+
+    assert next(vm) == 42
+    assert list(vm) == []
+
+
+def test_relative_base():
+    program = "109,1,204,-1,1001,100,1,100,1008,100,16,101,1006,101,0,99"
+
+    assert run(program) == list(map(int, program.split(",")))
+    assert run("1102,34915192,34915192,7,4,7,99,0") == [1219070632396864]
+    assert next(VM(parse_input("109,19,204,-34"), relative_base=2000)) == 0
+
+
+def test_self_modifying():
+    assert run("1101,3,1,4,0,0,99") == [1101]
+    assert run("1101,100,-1,4,0") == []
+
+
+def test_memory_growth():
+    vm = VM(parse_input("3,1000,4,1000,1101,7,8,5000,4,5000,99"))
+    vm.send(5)
+
+    assert list(vm) == [5, 15]
+    assert len(vm.memory) > 5000
+    assert vm.memory[1000] == 5
+    assert vm.memory[5000] == 15
+    assert run("4,2000,99") == [0]
+
+
+def test_outputs():
+    vm = VM(parse_input("104,1,3,7,4,7,99,0"))
+
+    assert list(vm.outputs()) == [1]
+
+    vm.send(5)
+
+    assert list(vm.outputs()) == [5]
+    assert vm.halted
+
+
+def test_fusion():
+    countdown = (
+        "109,40,1101,0,5,30,1001,30,-1,30,1005,30,6,21107,2,3,0,1206,0,24,204,0,4,30,99"
+    )
+
+    assert run(countdown) == [1, 0]
+
+    assert run("1107,1,2,8,1005,7,12,104,0,104,1,99,104,2,99") == [2]
+    assert run("109,5,1108,3,3,20,1205,15,13,104,0,99,0,104,1,99,0,0,0,0,0") == [1]
+
+
+def test_run():
+    vm = VM(parse_input("3,12,1001,12,-1,12,1005,12,2,104,7,99,0"))
+
+    assert vm.run(100) == Status.NEEDS_INPUT
+
+    vm.send(3)
+
+    assert vm.run(4) == Status.BUDGET_EXHAUSTED
+    assert vm.run(100) == Status.HAS_OUTPUT
+    assert vm.output.popleft() == 7
+
+    assert vm.run(100) == Status.HALTED
+    assert vm.run(100) == Status.HALTED
+
+
+def test_run_interleaved():
+    vm = VM(parse_input("104,1,3,9,4,9,104,3,99,0"), jit=True)
+
+    assert next(vm) == 1
+    assert vm.run(10) == Status.NEEDS_INPUT
+
+    vm.send(2)
+
+    assert list(vm) == [2, 3]
+    assert vm.halted
+
+
+def test_run_engines():
+    for jit in (False, True):
+        vm = VM(parse_input("1105,1,0"), jit=jit)
+
+        assert vm.run(1000) == Status.BUDGET_EXHAUSTED
+        assert vm.run(1000) == Status.BUDGET_EXHAUSTED
+
+    profile = Profile()
+
+    vm = VM(parse_input("3,5,4,5,99,0"), profile=profile)
+    vm.send(7)
+
+    assert vm.run(10) == Status.HAS_OUTPUT
+    assert vm.output.popleft() == 7
+    assert vm.run(10) == Status.HALTED
+    assert len(profile.io) == 2
@@ -0,0 +1,303 @@
+import collections
+import contextlib
+import enum
+import io
+import os
+from typing import BinaryIO, Iterator, NamedTuple, TypeAlias
+
+from .image import Program
+from .memo import digest
+from .profiler import Profile
+from .vm import VM
+
+MAGIC = b"ICTR"
+
+TRACE_DIR = "INTCODE_TRACE_DIR"
+
+
+class Kind(enum.IntEnum):
+    INPUT = 0
+    OUTPUT = 1
+    WAIT = 2
+    HALT = 3
+
+
+class Event(NamedTuple):
+    kind: Kind
+    value: int = 0
+    instructions: int = 0
+
+
+def write_varint(file: BinaryIO, value: int) -> None:
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+
+        if value:
+            file.write(bytes([byte | 0x80]))
+        else:
+            file.write(bytes([byte]))
+            return
+
+
+def read_varint(file: BinaryIO) -> int:
+    value = shift = 0
+
+    while True:
+        if not (data := file.read(1)):
+            raise ValueError("truncated intcode trace")
+
+        (byte,) = data
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if not byte & 0x80:
+            return value
+
+
+class Trace(NamedTuple):
+    digest: str
+    events: list[Event]
+    counts: bool = False
+
+    def dump(self, file: BinaryIO) -> None:
+        file.write(MAGIC)
+        file.write(bytes([self.counts]))
+        file.write(bytes.fromhex(self.digest))
+
+        for kind, value, instructions in self.events:
+            file.write(bytes([kind]))
+
+            if kind in (Kind.INPUT, Kind.OUTPUT):
+                write_varint(file, value << 1 if value >= 0 else (~value << 1) | 1)
+
+            if self.counts:
+                write_varint(file, instructions)
+
+    @classmethod
+    def load(cls, file: BinaryIO) -> "Trace":
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not an intcode trace")
+
+        counts = bool(file.read(1)[0])
+        program = file.read(32).hex()
+
+        events = []
+
+        while tag := file.read(1):
+            kind = Kind(tag[0])
+            value = instructions = 0
+
+            if kind in (Kind.INPUT, Kind.OUTPUT):
+                value = read_varint(file)
+                value = ~(value >> 1) if value & 1 else value >> 1
+
+            if counts:
+                instructions = read_varint(file)
+
+            events.append(Event(kind, value, instructions))
+
+        return cls(program, events, counts)
+
+    def to_bytes(self) -> bytes:
+        file = io.BytesIO()
+
+        self.dump(file)
+
+        return file.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Trace":
+        return cls.load(io.BytesIO(data))
+
+
+class Recorder:
+    def __init__(
+        self,
+        opcodes: Program,
+        path: str | None = None,
+        counts: bool = False,
+        jit: bool = False,
+    ) -> None:
+        if counts and jit:
+            raise ValueError("instruction counts need the interpreter, not the JIT")
+
+        self._profile = Profile() if counts else None
+        self._vm = VM(opcodes, jit=jit, profile=self._profile)
+        self._path = path
+        self._instructions = 0
+        self.trace = Trace(digest(opcodes), [], counts)
+
+    @property
+    def input(self) -> collections.deque[int]:
+        return self._vm.input
+
+    @property
+    def halted(self) -> bool:
+        return self._vm.halted
+
+    def send(self, value: int) -> None:
+        self._vm.send(value)
+
+    def outputs(self) -> Iterator[int]:
+        for value in self:
+            if value is None:
+                return
+
+            yield value
+
+    def close(self) -> None:
+        if self._path is not None:
+            with open(self._path, "wb") as file:
+                self.trace.dump(file)
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[int | None]:
+        return self
+
+    def __next__(self) -> int | None:
+        pending = list(self._vm.input) if self._vm.input else []
+
+        try:
+            value = next(self._vm)
+        except StopIteration:
+            self._record(pending, Kind.HALT)
+            self.close()
+            raise
+
+        self._record(pending, Kind.WAIT if value is None else Kind.OUTPUT, value or 0)
+
+        return value
+
+    def _record(self, pending: list[int], kind: Kind, value: int = 0) -> None:
+        consumed = len(pending) - len(self._vm.input)
+
+        for i in pending[:consumed]:
+            self.trace.events.append(Event(Kind.INPUT, i))
+
+        instructions = 0
+
+        if self._profile is not None:
+            total = sum(self._profile.opcodes.values())
+            instructions, self._instructions = total - self._instructions, total
+
+        self.trace.events.append(Event(kind, value, instructions))
+
+
+class Replayer:
+    def __init__(self, trace: Trace, opcodes: Program, jit: bool = False) -> None:
+        if trace.digest != digest(opcodes):
+            raise ValueError("trace was recorded for a different program")
+
+        self._events = collections.deque(trace.events)
+        self._opcodes = opcodes
+        self._jit = jit
+        self._input: collections.deque[int] = collections.deque()
+        self._consumed: list[int] = []
+        self._delivered = 0
+        self._halted = False
+        self._vm: VM | None = None
+
+    @property
+    def replaying(self) -> bool:
+        return self._vm is None
+
+    @property
+    def input(self) -> collections.deque[int]:
+        return self._input
+
+    @property
+    def halted(self) -> bool:
+        return self._halted if self._vm is None else self._vm.halted
+
+    def send(self, value: int) -> None:
+        self._input.append(value)
+
+    def outputs(self) -> Iterator[int]:
+        for value in self:
+            if value is None:
+                return
+
+            yield value
+
+    def __iter__(self) -> Iterator[int | None]:
+        return self
+
+    def __next__(self) -> int | None:
+        if self._vm is not None:
+            return next(self._vm)
+
+        if self._halted:
+            raise StopIteration
+
+        events = self._events
+
+        while events and events[0].kind == Kind.INPUT:
+            if not self._input:
+                return None
+
+            if self._input[0] != events[0].value:
+                return self._execute()
+
+            self._consumed.append(self._input.popleft())
+            events.popleft()
+
+        if not events or (events[0].kind == Kind.WAIT and self._input):
+            return self._execute()
+
+        kind, value, _ = events.popleft()
+
+        if kind == Kind.HALT:
+            self._halted = True
+
+            raise StopIteration
+
+        if kind == Kind.WAIT:
+            return None
+
+        self._delivered += 1
+
+        return value
+
+    def _execute(self) -> int | None:
+        vm = VM(self._opcodes, jit=self._jit)
+
+        for i in self._consumed:
+            vm.send(i)
+
+        for _ in range(self._delivered):
+            next(vm.outputs())
+
+        vm.input.extend(self._input)
+
+        self._input = vm.input
+        self._vm = vm
+
+        return next(vm)
+
+
+Machine: TypeAlias = VM | Recorder | Replayer
+
+
+@contextlib.contextmanager
+def traced(opcodes: Program, name: str, jit: bool = False) -> Iterator[Machine]:
+    if (directory := os.environ.get(TRACE_DIR)) is None:
+        yield VM(opcodes, jit=jit)
+        return
+
+    path = os.path.join(directory, f"{name}-{digest(opcodes)[:16]}.trace")
+
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            trace = Trace.load(file)
+
+        yield Replayer(trace, opcodes, jit)
+        return
+
+    with Recorder(opcodes, path, jit=jit) as recorder:
+        yield recorder
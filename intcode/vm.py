@@ -0,0 +1,505 @@
+import collections
+import enum
+import os
+from typing import Iterator
+
+from .cache import CACHE_DIR, load
+from .image import Program, ProgramImage
+from .induction import find_loop
+from .instruction import DECODED, OP_FN, Op, ParameterMode, decode
+from .jit import Block, compile_block
+from .memory import OFFSET, Memory, Pages, freeze, grow, read, write
+from .profiler import Profile
+from .snapshot import PAGE_BITS, PAGE_SIZE, Snapshot, paginate
+
+
+def parse_input(input: str) -> list[int]:
+    if (directory := os.environ.get(CACHE_DIR)) is not None:
+        try:
+            return load(input, directory).tolist()
+        except OverflowError:
+            pass
+
+    return list(map(int, input.strip().split(",")))
+
+
+UNLIMITED = 1 << 62
+
+
+class Status(enum.IntEnum):
+    NEEDS_INPUT = 0
+    HAS_OUTPUT = 1
+    HALTED = 2
+    BUDGET_EXHAUSTED = 3
+
+
+class VM:
+    def __init__(
+        self,
+        opcodes: Program,
+        relative_base: int = 0,
+        jit: bool = False,
+        profile: Profile | None = None,
+    ) -> None:
+        self._input: collections.deque[int] = collections.deque()
+        self._output: collections.deque[int] = collections.deque()
+
+        if isinstance(opcodes, ProgramImage):
+            self._pages: Pages = list(opcodes.snapshot.pages)
+        else:
+            self._pages = list(paginate(opcodes))
+
+        self._pc = 0
+        self._relative_base = relative_base
+        self._halted = False
+        self._blocks: dict[int, Block] = {}
+        self._code: dict[int, set[int]] = {}
+        self._jit = jit
+        self._profile = profile
+        self._budget = UNLIMITED
+        self._exhausted = False
+        self._iter = self._start()
+
+        if profile is not None:
+            profile.image_size = len(opcodes)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot, jit: bool = False) -> "VM":
+        vm = cls([], jit=jit)
+        vm.restore(snapshot)
+
+        return vm
+
+    @property
+    def memory(self) -> Memory:
+        return Memory(self._pages)
+
+    @property
+    def input(self) -> collections.deque[int]:
+        return self._input
+
+    @property
+    def output(self) -> collections.deque[int]:
+        return self._output
+
+    @property
+    def halted(self) -> bool:
+        return self._halted
+
+    def send(self, value: int) -> None:
+        self._input.append(value)
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(
+            freeze(self._pages),
+            self._pc,
+            self._relative_base,
+            tuple(self._input),
+            tuple(self._output),
+            self._halted,
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        self._pages[:] = snapshot.pages
+        self._pc = snapshot.pc
+        self._relative_base = snapshot.relative_base
+        self._halted = snapshot.halted
+        self._input.clear()
+        self._input.extend(snapshot.input)
+        self._output.clear()
+        self._output.extend(snapshot.output)
+        self._blocks.clear()
+        self._code.clear()
+        self._iter = self._start()
+
+    def fork(self) -> "VM":
+        return type(self).from_snapshot(self.snapshot(), self._jit)
+
+    def outputs(self) -> Iterator[int]:
+        for value in self:
+            if value is None:
+                return
+
+            yield value
+
+    def run(self, max_steps: int) -> Status:
+        if self._halted:
+            return Status.HALTED
+
+        self._budget = max_steps
+
+        try:
+            value = next(self._iter)
+        except StopIteration:
+            return Status.HALTED
+        finally:
+            self._budget = UNLIMITED
+
+        if value is not None:
+            self._output.append(value)
+
+            return Status.HAS_OUTPUT
+
+        if self._exhausted:
+            self._exhausted = False
+
+            return Status.BUDGET_EXHAUSTED
+
+        return Status.NEEDS_INPUT
+
+    def __iter__(self) -> Iterator[int | None]:
+        return self
+
+    def __next__(self) -> int | None:
+        return next(self._iter)
+
+    def _start(self) -> Iterator[int | None]:
+        if self._profile is not None:
+            return self._run_profiled(self._profile)
+
+        if self._jit:
+            return self._run_jit()
+
+        return self._run()
+
+    def _run(self) -> Iterator[int | None]:
+        memory = self._pages
+        input = self._input
+
+        ADD, MUL, INPUT, OUTPUT = Op.ADD, Op.MUL, Op.INPUT, Op.OUTPUT
+        JUMP_IF_TRUE, JUMP_IF_FALSE = Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE
+        LESS_THEN, EQUAL, ADJUST = Op.LESS_THEN, Op.EQUAL, Op.ADJUST
+        POSITION, IMMEDIATE, RELATIVE = ParameterMode
+        SHIFT, MASK = PAGE_BITS, OFFSET
+
+        pc = self._pc
+        relative_base = self._relative_base
+        budget = self._budget
+
+        while True:
+            if budget <= 0:
+                self._pc, self._relative_base = pc, relative_base
+                self._exhausted = True
+
+                yield None
+
+                budget = self._budget
+                continue
+
+            budget -= 1
+
+            try:
+                word = memory[pc >> SHIFT][pc & MASK]
+
+                if (instruction := DECODED.get(word)) is None:
+                    instruction = decode(word)
+
+                op, mode_a, mode_b, mode_c = instruction
+
+                a = pc + 1
+
+                if mode_a == POSITION:
+                    a = memory[a >> SHIFT][a & MASK]
+                elif mode_a == RELATIVE:
+                    a = relative_base + memory[a >> SHIFT][a & MASK]
+
+                if op == ADD or op == MUL or op == LESS_THEN or op == EQUAL:
+                    b = pc + 2
+
+                    if mode_b == POSITION:
+                        b = memory[b >> SHIFT][b & MASK]
+                    elif mode_b == RELATIVE:
+                        b = relative_base + memory[b >> SHIFT][b & MASK]
+
+                    c = pc + 3
+
+                    if mode_c == POSITION:
+                        c = memory[c >> SHIFT][c & MASK]
+                    elif mode_c == RELATIVE:
+                        c = relative_base + memory[c >> SHIFT][c & MASK]
+
+                    x = memory[a >> SHIFT][a & MASK]
+                    y = memory[b >> SHIFT][b & MASK]
+
+                    if op == ADD:
+                        value = x + y
+                    elif op == MUL:
+                        value = x * y
+                    elif op == LESS_THEN:
+                        value = 1 if x < y else 0
+                    else:
+                        value = 1 if x == y else 0
+
+                    page = memory[c >> SHIFT]
+
+                    if isinstance(page, tuple):
+                        page = memory[c >> SHIFT] = list(page)
+
+                    page[c & MASK] = value
+
+                    pc += 4
+
+                    if op == MUL or mode_c == IMMEDIATE:
+                        continue
+
+                    jump = DECODED.get(memory[pc >> SHIFT][pc & MASK])
+
+                    if jump is None or jump.a != mode_c:
+                        continue
+
+                    if jump.op == JUMP_IF_TRUE or jump.op == JUMP_IF_FALSE:
+                        fused = memory[(pc + 1) >> SHIFT][(pc + 1) & MASK]
+
+                        if mode_c == RELATIVE:
+                            fused += relative_base
+
+                        if fused == c:
+                            budget -= 1
+
+                            if (value != 0) == (jump.op == JUMP_IF_TRUE):
+                                b = pc + 2
+
+                                if jump.b == POSITION:
+                                    b = memory[b >> SHIFT][b & MASK]
+                                elif jump.b == RELATIVE:
+                                    b = relative_base + memory[b >> SHIFT][b & MASK]
+
+                                pc = memory[b >> SHIFT][b & MASK]
+                            else:
+                                pc += 3
+                elif op == JUMP_IF_TRUE or op == JUMP_IF_FALSE:
+                    if (memory[a >> SHIFT][a & MASK] != 0) == (op == JUMP_IF_TRUE):
+                        b = pc + 2
+
+                        if mode_b == POSITION:
+                            b = memory[b >> SHIFT][b & MASK]
+                        elif mode_b == RELATIVE:
+                            b = relative_base + memory[b >> SHIFT][b & MASK]
+
+                        pc = memory[b >> SHIFT][b & MASK]
+                    else:
+                        pc += 3
+                elif op == ADJUST:
+                    relative_base += memory[a >> SHIFT][a & MASK]
+
+                    pc += 2
+                elif op == INPUT:
+                    while not input:
+                        self._pc, self._relative_base = pc, relative_base
+
+                        yield None
+
+                        budget = self._budget
+
+                    write(memory, a, input.popleft())
+
+                    pc += 2
+                elif op == OUTPUT:
+                    self._pc, self._relative_base = pc + 2, relative_base
+
+                    yield memory[a >> SHIFT][a & MASK]
+
+                    budget = self._budget
+                    pc += 2
+                else:
+                    self._pc, self._relative_base = pc, relative_base
+                    self._halted = True
+
+                    return
+            except IndexError:
+                grow(memory, (len(memory) + 1) << SHIFT)
+
+    def _address(self, pc: int, mode: ParameterMode, relative_base: int) -> int:
+        if mode == ParameterMode.POSITION:
+            address = read(self._pages, pc)
+        elif mode == ParameterMode.RELATIVE:
+            address = relative_base + read(self._pages, pc)
+        else:
+            address = pc
+
+        if address >= len(self._pages) << PAGE_BITS:
+            grow(self._pages, address + 1)
+
+        return address
+
+    def _compile(self, pc: int) -> Block | None:
+        memory = self.memory
+
+        if pc + 4 > len(memory):
+            grow(self._pages, pc + 4)
+
+        if (block := compile_block(memory, pc)) is not None:
+            if (loop := find_loop(memory, pc)) is not None and loop.end == block.end:
+                block = block._replace(fn=loop.wrap(block.fn))
+
+            if block.extent >= len(memory):
+                grow(self._pages, block.extent + 1)
+
+            self._blocks[pc] = block
+
+            for address in range(block.start, block.end):
+                self._code.setdefault(address, set()).add(pc)
+
+        return block
+
+    def _invalidate(self, address: int) -> None:
+        for start in self._code.pop(address, ()):
+            block = self._blocks.pop(start)
+
+            for i in range(block.start, block.end):
+                if (owners := self._code.get(i)) is not None:
+                    owners.discard(start)
+
+                    if not owners:
+                        del self._code[i]
+
+    def _run_jit(self) -> Iterator[int | None]:
+        memory = self._pages
+        input = self._input
+        blocks = self._blocks
+        code = self._code
+
+        pc = self._pc
+        relative_base = self._relative_base
+        budget = self._budget
+
+        while True:
+            if budget <= 0:
+                self._pc, self._relative_base = pc, relative_base
+                self._exhausted = True
+
+                yield None
+
+                budget = self._budget
+                continue
+
+            budget -= 1
+
+            if (block := blocks.get(pc)) is None:
+                block = self._compile(pc)
+
+            if block is not None:
+                if block.reach is not None:
+                    if relative_base + block.reach >= len(memory) * PAGE_SIZE:
+                        grow(memory, relative_base + block.reach + 1)
+
+                pc, relative_base, written = block.fn(memory, relative_base, code)
+
+                if written is not None:
+                    self._invalidate(written)
+
+                budget -= block.steps
+                continue
+
+            budget -= 1
+
+            op, mode_a, _, _ = decode(read(memory, pc))
+
+            if op == Op.INPUT:
+                while not input:
+                    self._pc, self._relative_base = pc, relative_base
+
+                    yield None
+
+                    budget = self._budget
+
+                a = self._address(pc + 1, mode_a, relative_base)
+
+                write(memory, a, input.popleft())
+
+                if a in code:
+                    self._invalidate(a)
+
+                pc += 2
+            elif op == Op.OUTPUT:
+                a = self._address(pc + 1, mode_a, relative_base)
+
+                self._pc, self._relative_base = pc + 2, relative_base
+
+                yield read(memory, a)
+
+                budget = self._budget
+                pc += 2
+            else:
+                self._pc, self._relative_base = pc, relative_base
+                self._halted = True
+
+                return
+
+    def _run_profiled(self, profile: Profile) -> Iterator[int | None]:
+        memory = self.memory
+        input = self._input
+
+        pc = self._pc
+        relative_base = self._relative_base
+        budget = self._budget
+
+        def read(address: int) -> int:
+            profile.read(address)
+
+            return memory[address]
+
+        while True:
+            if budget <= 0:
+                self._pc, self._relative_base = pc, relative_base
+                self._exhausted = True
+
+                yield None
+
+                budget = self._budget
+                continue
+
+            budget -= 1
+
+            if pc + 4 > len(memory):
+                grow(self._pages, pc + 4)
+
+            op, mode_a, mode_b, mode_c = decode(memory[pc])
+
+            profile.execute(pc, op)
+
+            if op == Op.HALT:
+                self._pc, self._relative_base = pc, relative_base
+                self._halted = True
+
+                return
+
+            a = self._address(pc + 1, mode_a, relative_base)
+
+            if op in (Op.ADD, Op.MUL, Op.LESS_THEN, Op.EQUAL):
+                b = self._address(pc + 2, mode_b, relative_base)
+                c = self._address(pc + 3, mode_c, relative_base)
+
+                memory[c] = int(OP_FN[op](read(a), read(b)))
+
+                pc += 4
+            elif op in (Op.JUMP_IF_TRUE, Op.JUMP_IF_FALSE):
+                b = self._address(pc + 2, mode_b, relative_base)
+
+                pc = read(b) if OP_FN[op](read(a), 0) else pc + 3
+            elif op == Op.ADJUST:
+                relative_base += read(a)
+
+                pc += 2
+            elif op == Op.INPUT:
+                while not input:
+                    self._pc, self._relative_base = pc, relative_base
+
+                    yield None
+
+                    budget = self._budget
+
+                profile.io_event()
+
+                memory[a] = input.popleft()
+
+                pc += 2
+            else:
+                profile.io_event()
+
+                self._pc, self._relative_base = pc + 2, relative_base
+
+                yield read(a)
+
+                budget = self._budget
+                pc += 2